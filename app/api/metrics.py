@@ -0,0 +1,121 @@
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.core import queries, timing
+from app.core.admission import admission, rate_limiter
+from app.core.config import settings
+from app.core.database import InstrumentedQueuePool, async_engine, pool_stats, replicas
+from app.core.metrics import expose_histogram, expose_samples
+from app.core.response_cache import response_cache
+from app.core.security import password_hasher, token_cache
+from app.permissions.cache import principal_cache
+
+router = APIRouter()
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pool_lines() -> list:
+    engines = [("primary", async_engine)] + [
+        (f"replica{i}", engine) for i, engine in enumerate(replicas.engines)
+    ]
+    stats = [(name, pool_stats(engine)) for name, engine in engines]
+    lines = []
+    for key, help in (
+        ("checked_out", "Connections currently checked out."),
+        ("idle", "Idle connections in the pool."),
+        ("overflow", "Connections open beyond pool_size."),
+    ):
+        lines += expose_samples(
+            f"db_pool_{key}", "gauge", help,
+            [({"engine": name}, s[key]) for name, s in stats if key in s],
+        )
+    lines += expose_samples(
+        "db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection.",
+        [({"engine": name}, s["timeouts"]) for name, s in stats if "timeouts" in s],
+    )
+    waits = [(name, engine.pool) for name, engine in engines if isinstance(engine.pool, InstrumentedQueuePool)]
+    if waits:
+        lines += ["# HELP db_pool_wait_seconds Time spent waiting for a connection.",
+                  "# TYPE db_pool_wait_seconds histogram"]
+        for name, pool in waits:
+            lines += expose_histogram("db_pool_wait_seconds", pool.wait_time, ("engine",), (name,))
+    return lines
+
+
+def _query_lines() -> list:
+    lines = queries.QUERIES_PER_REQUEST.expose()
+    lines += expose_samples(
+        "db_slow_queries_total", "counter", "Statements slower than DB_SLOW_QUERY_MS.",
+        [({}, queries.slow_queries)],
+    )
+    lines += expose_samples(
+        "db_n_plus_one_requests_total", "counter", "Requests that repeated one statement DB_N_PLUS_ONE_THRESHOLD times.",
+        [({"route": route}, count) for route, count in queries.n_plus_one_requests.items()],
+    )
+    return lines
+
+
+def _cache_lines() -> list:
+    caches = {
+        "principal": principal_cache.stats(),
+        "token": token_cache.stats(),
+        "response": response_cache.stats(),
+    }
+    lines = expose_samples(
+        "cache_hits_total", "counter", "Cache lookups served from the cache.",
+        [({"cache": name}, s["hits"] + s.get("coalesced", 0)) for name, s in caches.items()],
+    )
+    lines += expose_samples(
+        "cache_misses_total", "counter", "Cache lookups that had to be computed.",
+        [({"cache": name}, s["misses"]) for name, s in caches.items()],
+    )
+    lines += ["# HELP jwt_decode_seconds Time spent verifying JWT signatures.",
+              "# TYPE jwt_decode_seconds histogram"]
+    lines += expose_histogram("jwt_decode_seconds", token_cache.decode_time)
+    return lines
+
+
+def _hasher_lines() -> list:
+    stats = password_hasher.stats()
+    lines = expose_samples("password_hash_in_flight", "gauge", "Hashes running now.", [({}, stats["in_flight"])])
+    lines += expose_samples("password_hash_queued", "gauge", "Hashes waiting for a slot.", [({}, stats["queued"])])
+    lines += expose_samples("password_hash_completed_total", "counter", "Hashes completed.", [({}, stats["completed"])])
+    return lines
+
+
+def _admission_lines() -> list:
+    gates = admission.stats()
+    lines = expose_samples(
+        "admission_in_flight", "gauge", "Requests admitted and running, per route.",
+        [({"route": route}, s["in_flight"]) for route, s in gates.items()],
+    )
+    lines += expose_samples(
+        "admission_queued", "gauge", "Requests waiting for a slot, per route.",
+        [({"route": route}, s["queued"]) for route, s in gates.items()],
+    )
+    lines += expose_samples(
+        "admission_shed_total", "counter", "Requests answered 503 because the queue was full or the wait timed out.",
+        [({"route": route}, s["rejected"] + s["timed_out"]) for route, s in gates.items()],
+    )
+    lines += expose_samples(
+        "rate_limited_total", "counter", "Requests answered 429, per rate limit rule.",
+        [({"rule": rule}, count) for rule, count in rate_limiter.limited.items()],
+    )
+    return lines
+
+
+# Prometheus scrape endpoint; guarded by METRICS_TOKEN when it is set
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    if settings.METRICS_TOKEN:
+        supplied = request.headers.get("Authorization", "").replace("Bearer ", "", 1)
+        if not secrets.compare_digest(supplied, settings.METRICS_TOKEN):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+    lines = timing.REQUEST_DURATION.expose() + timing.PHASE_DURATION.expose()
+    lines += _query_lines() + _pool_lines() + _cache_lines() + _hasher_lines() + _admission_lines()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
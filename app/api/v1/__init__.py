@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import user, auth  # , students, teachers,tasks, user # etc
+from .endpoints import user, auth, stats  # , students, teachers,tasks, user # etc
 
 api_router = APIRouter()
 
@@ -9,3 +9,4 @@ api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
 # api_router.include_router(teachers.router, prefix="/teachers", tags=["Teachers"])
 # api_router.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
 api_router.include_router(user.router, prefix="/users", tags=["Users"])
+api_router.include_router(stats.router, prefix="/stats", tags=["Stats"])
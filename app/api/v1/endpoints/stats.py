@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Request
+
+from app.core.admission import admission, rate_limiter
+from app.core.database import pool_stats
+from app.core.response_cache import response_cache
+from app.core.security import password_hasher, token_cache
+from app.permissions.base import IsSuperAdmin, permissions
+from app.permissions.cache import principal_cache
+
+router = APIRouter()
+
+
+# Principal cache hit/miss counters
+@router.get("/principal-cache")
+@permissions([IsSuperAdmin])
+async def principal_cache_stats(request: Request):
+    return principal_cache.stats()
+
+
+# Password hashing pool: concurrency, queue depth and wait times
+@router.get("/password-hasher")
+@permissions([IsSuperAdmin])
+async def password_hasher_stats(request: Request):
+    return password_hasher.stats()
+
+
+# Verified-token cache hit ratio and JWT decode times
+@router.get("/token-cache")
+@permissions([IsSuperAdmin])
+async def token_cache_stats(request: Request):
+    return token_cache.stats()
+
+
+# Connection pool occupancy, checkout wait times and timeouts
+@router.get("/pool")
+@permissions([IsSuperAdmin])
+async def pool(request: Request):
+    return pool_stats()
+
+
+# Response cache hits, coalesced misses and size
+@router.get("/response-cache")
+@permissions([IsSuperAdmin])
+async def response_cache_stats(request: Request):
+    return response_cache.stats()
+
+
+# Seconds spent on imports, schema check and warm-up when this worker started
+@router.get("/startup")
+@permissions([IsSuperAdmin])
+async def startup(request: Request):
+    return getattr(request.app.state, "startup", None)
+
+
+# Per-route concurrency, queue depth and shed requests; rate-limited requests per rule
+@router.get("/admission")
+@permissions([IsSuperAdmin])
+async def admission_stats(request: Request):
+    return {"routes": admission.stats(), "rate_limits": rate_limiter.stats()}
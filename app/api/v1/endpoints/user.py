@@ -1,23 +1,33 @@
 from app.core.pagination import PaginationParams, paginated, pagination_params
+from app.core.search import SEARCH_MODES
 from app.permissions.base import IsSuperAdmin, permissions, IsAdmin
 from app.repositories.user_repository import UserRepository
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 # from app.permissions.base import  IsSuperAdmin, permissions
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.user import PaginatedUsers, UserCreate, UserResponse, UserUpdate
+from app.schemas.user import PaginatedUsers, UserBatchUpdate, UserCreate, UserResponse, UserUpdate
 from app.services.user_service import (
     create_user,
+    get_user,
     get_users,
     update_user,
+    update_users,
     # get_student_by_id,
     # update_student,
     # delete_student,
 )
-from app.core.database import get_db
+from app.services.user_export_service import EXPORT_FORMATS, export_users
+from app.services.user_import_service import import_users, rows_for_content_type
+from app.core.database import get_db, get_unit_of_work
+from app.core.etag import conditional_hit, not_modified, set_etag, table_etag
+from app.core.response_cache import cached
+from app.core.responses import ORJSONResponse
+from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 router = APIRouter()
@@ -38,28 +48,76 @@ async def create(
     #return await create_user(db, user)
 
 
+# Bulk import users from a streamed CSV or NDJSON body
+@router.post("/import")
+@permissions([IsSuperAdmin])
+async def bulk_import(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    rows = rows_for_content_type(request.headers.get("content-type", ""), request.stream())
+    return await import_users(rows, UserRepository(db), get_unit_of_work(request))
+
+
+# Stream every matching user as NDJSON or CSV
+@router.get("/export")
+@permissions([IsSuperAdmin])
+async def export(
+    request: Request,
+    format: str = Query("ndjson", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    search: Optional[str] = None,
+    search_mode: str = Query("substring", pattern=f"^({'|'.join(SEARCH_MODES)})$"),
+):
+    # The request's unit of work stays open until the last chunk is sent
+    db = get_unit_of_work(request).session
+    return StreamingResponse(
+        export_users(db, format, search, search_mode),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+
 # get users List
 @router.get("/", response_model=PaginatedUsers)
 @permissions([IsSuperAdmin])
+@cached(tags=[User.__tablename__], vary="role")
 async def list(
     request: Request,
     db: AsyncSession = Depends(get_db),
     search: Optional[str] = None,
+    search_mode: str = Query("substring", pattern=f"^({'|'.join(SEARCH_MODES)})$"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of user fields"),
     pagination: PaginationParams = Depends(pagination_params)  # injected by decorator
 ):
-    items, total = await get_users(db, search, pagination)
-    
-    # Convert SQLModel objects to Pydantic models
-    user_responses = [UserResponse.from_orm(user) for user in items]
+    # Unchanged since the client's copy: answer before running the page query
+    etag = await table_etag(db, User.__tablename__, request)
+    if conditional_hit(request, etag):
+        return not_modified(etag)
+
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    items, page_info = await get_users(db, search, search_mode, field_list, pagination=pagination)
     
-    return {
-        "items": user_responses,
-        "pagination": {
-            "total": total,
-            "limit": pagination.limit,
-            "offset": pagination.offset,
-        },
-    }
+    # Rows come straight from the projected columns; returning a response
+    # skips re-validating them against PaginatedUsers (kept for the docs)
+    return set_etag(ORJSONResponse({
+        "items": items,
+        "pagination": page_info,
+    }), etag)
+
+
+# Get a user by ID
+@router.get("/{user_id}", response_model=UserResponse)
+@permissions([IsSuperAdmin])
+@cached(tags=[User.__tablename__], vary="role")
+async def retrieve(
+    user_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    etag = await table_etag(db, User.__tablename__, request)
+    if conditional_hit(request, etag):
+        return not_modified(etag)
+    return set_etag(ORJSONResponse(await get_user(db, user_id)), etag)
 
 # Partial update user by ID
 @router.patch("/{user_id}", response_model=UserResponse)
@@ -71,4 +129,16 @@ async def partial_update(
     db: AsyncSession = Depends(get_db)  
 ):
     
-    return await update_user(db,user_id, user)
\ No newline at end of file
+    return await update_user(db,user_id, user)
+
+
+# Partial update of many users in one transaction
+@router.patch("/", response_model=List[UserResponse])
+@permissions([IsSuperAdmin])
+async def batch_update(
+    request: Request,
+    updates: List[UserBatchUpdate],
+    db: AsyncSession = Depends(get_db)
+):
+    return await update_users(db, updates)
+
@@ -0,0 +1,290 @@
+# admission.py
+import asyncio
+import logging
+import math
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import Scope
+
+from app.core.config import settings
+from app.core.security import password_hasher, verify_token
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """The route's concurrency limit and wait queue are both full."""
+
+
+class RouteGate:
+    """
+    Concurrency limit for one route with a bounded FIFO wait queue. A request
+    beyond ``limit`` waits for a slot; one beyond ``limit + queue_size``, or
+    one that waited ``timeout`` seconds, is rejected with :class:`Overloaded`.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            raise Overloaded()
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Handed a slot just as we gave up: pass it on
+                self.release()
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise Overloaded() from None
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        # The slot goes straight to the next waiter, so in_flight stays put
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+class AdmissionControl:
+    """
+    One :class:`RouteGate` per ``"METHOD /route/template"``, created on first
+    use. Routes that hash passwords get ``hash_limit`` (the hasher's own
+    concurrency by default), everything else ``limit``. Per worker: each
+    process protects its own pool and CPU.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float, hash_limit: int):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.hash_limit = hash_limit or password_hasher.max_concurrency
+        self.enabled = limit > 0
+        self.gates: Dict[str, RouteGate] = {}
+
+    def gate(self, route: str) -> RouteGate:
+        gate = self.gates.get(route)
+        if gate is None:
+            limit = self.hash_limit if route in HASHING_ROUTES else self.limit
+            gate = self.gates[route] = RouteGate(limit, self.queue_size, self.timeout)
+        return gate
+
+    def stats(self) -> dict:
+        return {route: gate.stats() for route, gate in self.gates.items()}
+
+
+class LocalBucketBackend:
+    """Token buckets in this process; the least recently used are forgotten past ``maxsize``."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens >= 1:
+            tokens, wait = tokens - 1, 0.0
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return wait
+
+    async def close(self) -> None:
+        pass
+
+
+# Refill, take one token and report the wait, atomically; buckets expire once
+# they would be full again anyway
+TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisBucketBackend:
+    """
+    Token buckets shared by every worker. ``client`` may be any object with
+    the redis.asyncio API (register_script/close); otherwise one is created
+    from ``url``.
+    """
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = "rate-limit:"):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(TAKE_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        wait = await self._take(keys=[self.prefix + key], args=[rate, burst, time.time()])
+        return float(wait)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class RateLimit:
+    __slots__ = ("rate", "burst")
+
+    def __init__(self, per_minute: int, burst: int):
+        self.rate = per_minute / 60
+        self.burst = max(burst, 1)
+
+
+class RateLimiter:
+    """
+    Token-bucket limits keyed by the authenticated principal (from the bearer
+    token, without a database lookup) or else the client IP. A route in
+    ``rules`` gets its own, usually stricter, bucket; every other route
+    shares ``default``. A backend error lets the request through.
+    """
+
+    def __init__(self, backend, default: RateLimit, rules: Dict[str, RateLimit]):
+        self.backend = backend
+        self.default = default
+        self.rules = rules
+        self.enabled = settings.RATE_LIMIT_ENABLED
+        self.allowed = 0
+        self.limited: Counter = Counter()
+
+    @staticmethod
+    def client_key(scope: Scope) -> str:
+        """
+        ``user:<sub>`` for a valid bearer token, else ``ip:<address>``. Invalid
+        or expired tokens count against the IP, so a bogus header cannot dodge
+        the login limit. Behind a proxy the address is only the client's when
+        the server rewrites it from X-Forwarded-For: app.serve does so for
+        peers in FORWARDED_ALLOW_IPS (plain uvicorn reads the same variable).
+        """
+        authorization = Headers(scope=scope).get("authorization", "")
+        if authorization.startswith("Bearer "):
+            try:
+                return f"user:{verify_token(authorization[7:]).get('sub')}"
+            except HTTPException:
+                pass
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def check(self, scope: Scope, route: str) -> float:
+        """Seconds the caller must wait before retrying; 0 if the request may proceed."""
+        limit = self.rules.get(route)
+        bucket = route if limit is not None else "default"
+        limit = limit or self.default
+        if limit.rate <= 0:
+            return 0.0
+        key = f"{bucket}|{self.client_key(scope)}"
+        try:
+            wait = await self.backend.take(key, limit.rate, limit.burst)
+        except Exception:
+            logger.warning("rate limit backend failed, allowing the request", exc_info=True)
+            return 0.0
+        if wait > 0:
+            self.limited[bucket] += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "enabled": self.enabled,
+            "allowed": self.allowed,
+            "limited": dict(self.limited),
+        }
+
+
+def retry_after(seconds: float) -> str:
+    return str(max(math.ceil(seconds), 1))
+
+
+LOGIN_ROUTE = "POST /api/v1/auth/login"
+CREATE_USER_ROUTE = "POST /api/v1/users/"
+# Routes that run bcrypt, gated to the password hasher's concurrency
+HASHING_ROUTES = {LOGIN_ROUTE, CREATE_USER_ROUTE}
+
+
+def _build_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisBucketBackend(settings.RATE_LIMIT_REDIS_URL)
+    return LocalBucketBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+admission = AdmissionControl(
+    limit=settings.ADMISSION_CONCURRENCY,
+    queue_size=settings.ADMISSION_QUEUE_SIZE,
+    timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+    hash_limit=settings.ADMISSION_HASH_CONCURRENCY,
+)
+
+rate_limiter = RateLimiter(
+    backend=_build_backend(),
+    default=RateLimit(settings.RATE_LIMIT_PER_MINUTE, settings.RATE_LIMIT_BURST),
+    rules={
+        # Guessing passwords and mass sign-ups are the expensive abuses
+        LOGIN_ROUTE: RateLimit(settings.RATE_LIMIT_LOGIN_PER_MINUTE, settings.RATE_LIMIT_LOGIN_BURST),
+        CREATE_USER_ROUTE: RateLimit(
+            settings.RATE_LIMIT_CREATE_USER_PER_MINUTE, settings.RATE_LIMIT_CREATE_USER_BURST
+        ),
+    },
+)
@@ -1,13 +1,120 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db/postgres")
     print(DATABASE_URL)
+
+    # Connection pool: profile is dev | prod | test, unset overrides keep the profile value
+    DB_POOL_PROFILE: str = os.getenv("DB_POOL_PROFILE", "dev")
+    # (read from the environment by BaseSettings)
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[float] = None
+    DB_POOL_RECYCLE: Optional[int] = None
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_ECHO: Optional[bool] = None  # True logs every statement
+    # Run list counts on a second pooled connection, concurrently with the
+    # page query: lower latency, but each such request holds two connections,
+    # so size the pool for twice the concurrent list requests
+    PAGINATION_PARALLEL_COUNT: bool = os.getenv("PAGINATION_PARALLEL_COUNT", "False") == "True"
+    # Read replicas: comma-separated URLs, round_robin | least_loaded
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    DB_REPLICA_STRATEGY: str = os.getenv("DB_REPLICA_STRATEGY", "round_robin")
+    DB_REPLICA_RETRY_SECONDS: int = int(os.getenv("DB_REPLICA_RETRY_SECONDS", 30))
+    # Query instrumentation: log statements slower than this (0 = off) and
+    # requests repeating one statement this many times (likely N+1, 0 = off)
+    DB_SLOW_QUERY_MS: int = int(os.getenv("DB_SLOW_QUERY_MS", 200))
+    DB_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 20))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))  # asyncpg prepared statements
+
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+
+    # Password hashing (0 = one per CPU)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # thread | process
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 0))
+    PASSWORD_HASH_MAX_CONCURRENCY: int = int(os.getenv("PASSWORD_HASH_MAX_CONCURRENCY", 0))
+
+    # Bulk user import
+    USER_IMPORT_BATCH_SIZE: int = int(os.getenv("USER_IMPORT_BATCH_SIZE", 500))
+
+    # Streaming user export: rows fetched from the server-side cursor per chunk
+    USER_EXPORT_CHUNK_ROWS: int = int(os.getenv("USER_EXPORT_CHUNK_ROWS", 1000))
+
+    # Response compression (gzip, or brotli when installed): bodies under the minimum go out as is
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+    # Cache of rendered GET responses (0 TTL disables it): local | redis
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "local")
+    RESPONSE_CACHE_REDIS_URL: str = os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", 1000))
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", 30))
+    RESPONSE_CACHE_LOCK_TIMEOUT: float = float(os.getenv("RESPONSE_CACHE_LOCK_TIMEOUT", 5))
+
+    # Pagination
+    PAGINATION_COUNT_CACHE_TTL: int = int(os.getenv("PAGINATION_COUNT_CACHE_TTL", 30))
+
+    # Principal cache used by the permission checks
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+    PRINCIPAL_CACHE_BACKEND: str = os.getenv("PRINCIPAL_CACHE_BACKEND", "local")  # local | postgres
+
+    # Bearer token required by /metrics; empty leaves it open (scrape it on a private network)
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+
+    # Startup: verify | warn | create | off (see app/core/startup.py); pool
+    # connections opened before serving (0 = pool_size)
+    STARTUP_SCHEMA_CHECK: str = os.getenv("STARTUP_SCHEMA_CHECK", "verify")
+    STARTUP_WARM_CONNECTIONS: int = int(os.getenv("STARTUP_WARM_CONNECTIONS", 0))
+    STARTUP_WARM_STATEMENTS: bool = os.getenv("STARTUP_WARM_STATEMENTS", "True") == "True"
+    ALEMBIC_CONFIG: str = os.getenv(
+        "ALEMBIC_CONFIG", os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+    )
+
+    # Admission control, per worker and route: requests beyond the concurrency
+    # limit wait in a bounded queue, and are shed with 503 once it is full or
+    # after the queue timeout (0 concurrency = off). Password hashing routes
+    # use the hash limit (0 = PASSWORD_HASH_MAX_CONCURRENCY)
+    ADMISSION_CONCURRENCY: int = int(os.getenv("ADMISSION_CONCURRENCY", 32))
+    ADMISSION_HASH_CONCURRENCY: int = int(os.getenv("ADMISSION_HASH_CONCURRENCY", 0))
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", 64))
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 5))
+    ADMISSION_RETRY_AFTER: int = int(os.getenv("ADMISSION_RETRY_AFTER", 1))
+
+    # Token-bucket rate limits per principal or client IP, answered with 429
+    # (0 per minute = no limit): local | redis
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True") == "True"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "local")
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+    RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", 600))
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", 100))
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_LOGIN_PER_MINUTE", 10))
+    RATE_LIMIT_LOGIN_BURST: int = int(os.getenv("RATE_LIMIT_LOGIN_BURST", 5))
+    RATE_LIMIT_CREATE_USER_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_CREATE_USER_PER_MINUTE", 30))
+    RATE_LIMIT_CREATE_USER_BURST: int = int(os.getenv("RATE_LIMIT_CREATE_USER_BURST", 10))
+
+    # Production server (python -m app.serve). Workers 0 = one per available
+    # CPU; keep-alive should outlast the load balancer's idle timeout, and the
+    # graceful timeout stay under the orchestrator's kill deadline
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", 8000))
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", 0))
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", 2048))
+    SERVER_KEEPALIVE_SECONDS: int = int(os.getenv("SERVER_KEEPALIVE_SECONDS", 5))
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", 20))
+    SERVER_ACCESS_LOG: bool = os.getenv("SERVER_ACCESS_LOG", "False") == "True"
+    # Proxies trusted to set X-Forwarded-For (comma-separated IPs, "*" = any);
+    # rate limits key on the client address this yields
+    FORWARDED_ALLOW_IPS: str = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
 
     # Debug Mode
     DEBUG: bool = os.getenv("DEBUG", "True") == "True"
@@ -1,49 +1,300 @@
 # app/core/database.py
-from sqlmodel import SQLModel
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import inspect
+import itertools
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import Select
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from starlette.requests import Request
+from typing import Any, Callable, List, Optional
 from app.core.config import settings
-# Convert sync URL to async URL
-async_database_url = settings.DATABASE_URL.replace(
-    "postgresql://", "postgresql+asyncpg://"
-)
+from app.core.metrics import Histogram
+from app.models import Base
+from app.core.queries import instrument_engine
+
+# Named pool profiles; DB_POOL_* settings override individual values. No
+# profile echoes statements (logging each one is costly on the request
+# path), DB_ECHO=True turns it on
+POOL_PROFILES = {
+    "dev": {
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "echo": False,
+    },
+    "prod": {
+        "pool_size": 10,
+        "max_overflow": 10,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "echo": False,
+    },
+    # Every checkout opens a fresh connection: no state leaks between tests
+    "test": {"poolclass": NullPool, "echo": False},
+}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram()
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - started)
+
+
+def pool_options(profile: str, url: str) -> dict:
+    options = dict(POOL_PROFILES[profile])
+    overrides = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.DB_ECHO,
+    }
+    if options.get("poolclass") is NullPool:
+        overrides = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    options.update({key: value for key, value in overrides.items() if value is not None})
+
+    if url.startswith("sqlite"):
+        # SQLite picks its own pool; sizing options do not apply
+        for key in ("pool_size", "max_overflow", "pool_timeout"):
+            options.pop(key, None)
+    elif "poolclass" not in options:
+        options["poolclass"] = InstrumentedQueuePool
+
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+
+def build_engine(url: str, profile: str = settings.DB_POOL_PROFILE) -> AsyncEngine:
+    # Convert sync URL to async URL
+    url = url.replace("postgresql://", "postgresql+asyncpg://")
+    engine = create_async_engine(url, **pool_options(profile, url))
+    instrument_engine(engine.sync_engine)
+    return engine
+
 
 # Create async engine
-async_engine = create_async_engine(
-    async_database_url,
-    echo=True,
-    future=True
-)
+async_engine = build_engine(settings.DATABASE_URL)
+
+
+class ReplicaSet:
+    """
+    Read replicas with round-robin or least-loaded selection. A replica that
+    raises a connection error is skipped for ``retry_after`` seconds, during
+    which reads fall back to the primary.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], strategy: str = "round_robin", retry_after: float = 30):
+        self.engines = engines
+        self.strategy = strategy
+        self.retry_after = retry_after
+        self._unhealthy_until = {id(engine): 0.0 for engine in engines}
+        self._cycle = itertools.cycle(engines) if engines else None
+        for engine in engines:
+            event.listen(engine.sync_engine, "handle_error", self._on_error(engine))
+
+    def _on_error(self, engine: AsyncEngine):
+        def handle_error(context):
+            # No connection means the connect itself failed
+            if context.is_disconnect or context.connection is None:
+                self.mark_unhealthy(engine)
+
+        return handle_error
 
-# Async session factory
-AsyncSessionLocal = sessionmaker(
-    bind=async_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autoflush=False,
-    autocommit=False
+    def mark_unhealthy(self, engine: AsyncEngine) -> None:
+        self._unhealthy_until[id(engine)] = time.monotonic() + self.retry_after
+
+    def healthy(self) -> List[AsyncEngine]:
+        now = time.monotonic()
+        return [e for e in self.engines if self._unhealthy_until[id(e)] <= now]
+
+    def choose(self) -> Optional[AsyncEngine]:
+        healthy = self.healthy()
+        if not healthy:
+            return None
+        if self.strategy == "least_loaded":
+            return min(healthy, key=lambda e: getattr(e.pool, "checkedout", lambda: 0)())
+        for _ in range(len(self.engines)):
+            engine = next(self._cycle)
+            if engine in healthy:
+                return engine
+        return None
+
+    def stats(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            dict(pool_stats(engine), url=engine.url.render_as_string(hide_password=True),
+                 healthy=self._unhealthy_until[id(engine)] <= now)
+            for engine in self.engines
+        ]
+
+
+replicas = ReplicaSet(
+    [build_engine(url) for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    strategy=settings.DB_REPLICA_STRATEGY,
+    retry_after=settings.DB_REPLICA_RETRY_SECONDS,
 )
+
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to a replica unless the session is pinned to the
+    primary. Any write (flush, INSERT/UPDATE/DELETE, raw SQL) pins it, so the
+    rest of the request reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if not self.info.get("use_primary"):
+            if isinstance(clause, Select) and not self._flushing:
+                replica = replicas.choose()
+                if replica is not None:
+                    return replica.sync_engine
+            else:
+                self.info["use_primary"] = True
+        return async_engine.sync_engine
+
+
+# Async session factory; pass info={"use_primary": True} for read-write work
 async_session_factory = sessionmaker(
-    async_engine, class_=AsyncSession, expire_on_commit=False
+    async_engine, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
 )
+
+
+def pool_stats(engine: AsyncEngine = async_engine) -> dict:
+    pool = engine.pool
+    stats = {"profile": settings.DB_POOL_PROFILE, "pool": type(pool).__name__}
+    if engine is async_engine:
+        stats["replicas"] = replicas.stats()
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            }
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats["wait_seconds"] = pool.wait_time.snapshot()
+        stats["timeouts"] = pool.timeouts
+    return stats
+
+
+READ_ONLY_METHODS = ("GET", "HEAD")
+
+
+class UnitOfWork:
+    """
+    Request-scoped database session shared by the auth layer, services and
+    repositories. The session is only created on first access, and a pooled
+    connection is only checked out once it runs a statement.
+    """
+
+    def __init__(self, session_factory=None, read_only: bool = False):
+        self._session_factory = session_factory or async_session_factory
+        self._session: Optional[AsyncSession] = None
+        # Only read-only requests may be served by replicas
+        self.read_only = read_only
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_factory(info={"use_primary": not self.read_only})
+        return self._session
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    async def commit(self) -> None:
+        if self._session is None:
+            return
+        await self._session.commit()
+        callbacks = self._session.info.pop("after_commit", [])
+        for callback in callbacks:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+
+    async def rollback(self) -> None:
+        if self._session is None:
+            return
+        self._session.info.pop("after_commit", None)
+        await self._session.rollback()
+
+    async def close(self) -> None:
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        await session.close()
+
+
+def sibling_session(db: AsyncSession) -> AsyncSession:
+    """A separate session routed like ``db``, for work that must run alongside it."""
+    return async_session_factory(info={"use_primary": db.info.get("use_primary", True)})
+
+
+def on_commit(db: AsyncSession, callback: Callable[[], Any]) -> None:
+    """Run ``callback`` (awaited if it returns an awaitable) once the request's unit of work commits."""
+    db.info.setdefault("after_commit", []).append(callback)
+
+
+def get_unit_of_work(request: Request) -> UnitOfWork:
+    uow = getattr(request.state, "db", None)
+    if uow is None:
+        uow = UnitOfWork(read_only=request.method in READ_ONLY_METHODS)
+        request.state.db = uow
+    return uow
+
+
 # Async dependency
-async def get_db():
+async def get_db(request: Request):
     """
-    Dependency that provides a transactional database session.
-    Handles commit, rollback, and closing.
+    Dependency that provides the request's transactional database session.
+    Handles commit and rollback; DBSessionMiddleware closes it.
     """
-    async with async_session_factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    # Outside DBSessionMiddleware (scripts, bare apps) this dependency owns the session
+    owner = getattr(request.state, "db", None) is None
+    uow = get_unit_of_work(request)
+    try:
+        yield uow.session
+        await uow.commit()
+    except Exception:
+        await uow.rollback()
+        raise
+    finally:
+        if owner:
+            await uow.close()
+
+async def dispose_engines() -> None:
+    """Close every pooled connection (primary and replicas); run at shutdown."""
+    for engine in [async_engine, *replicas.engines]:
+        await engine.dispose()
+
 
-# Async table creation
+# Async table creation, for databases not managed by Alembic (STARTUP_SCHEMA_CHECK=create)
 async def create_db_and_tables():
     async with async_engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(Base.metadata.create_all)
     print("Database tables created successfully!")
\ No newline at end of file
@@ -0,0 +1,135 @@
+# etag.py
+import asyncio
+import hashlib
+import logging
+from typing import Dict
+from fastapi import Request, Response
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import database
+from app.models.table_version import TableVersion
+
+logger = logging.getLogger(__name__)
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+UPSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Clients may reuse a response only after revalidating it
+CACHE_CONTROL = "private, no-cache"
+
+
+async def _upsert_version(table: str) -> None:
+    async with database.async_engine.begin() as conn:
+        dialect = conn.dialect.name
+        if dialect in UPSERTS:
+            stmt = UPSERTS[dialect](TableVersion).values(name=table, version=1)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[TableVersion.name],
+                set_={"version": TableVersion.version + 1},
+            )
+            await conn.execute(stmt)
+            return
+
+        result = await conn.execute(
+            update(TableVersion)
+            .where(TableVersion.name == table)
+            .values(version=TableVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            await conn.execute(insert(TableVersion).values(name=table, version=1))
+
+
+# Per table: the bump running now, and the one queued to run after it
+_running: Dict[str, asyncio.Task] = {}
+_queued: Dict[str, asyncio.Task] = {}
+
+
+async def _run_bump(table: str, after: asyncio.Task = None) -> None:
+    if after is not None:
+        await asyncio.wait([after])
+        _queued.pop(table, None)
+        _running[table] = asyncio.current_task()
+    try:
+        await _upsert_version(table)
+    except Exception:
+        # The write itself is committed; failing its request would not undo it
+        logger.warning(
+            "version bump for %s failed, its ETags stay stale until the next write", table, exc_info=True
+        )
+    finally:
+        if _running.get(table) is asyncio.current_task():
+            del _running[table]
+
+
+async def bump_version(table: str) -> None:
+    """
+    Mark ``table`` as changed. Call it once the write has committed
+    (``on_commit``): it runs in a short transaction of its own, so the one
+    hot row is never locked for the length of a writer's transaction.
+
+    Concurrent calls in this process are coalesced: a caller joins the bump
+    queued behind the running one (which starts after its commit, so it
+    covers it) or starts one, so a burst of writes costs about two upserts.
+    Between a commit and its bump a reader may still get the old version,
+    and so a 304, for the length of one statement.
+    """
+    task = _queued.get(table)
+    if task is None:
+        running = _running.get(table)
+        task = asyncio.create_task(_run_bump(table, running))
+        if running is None:
+            _running[table] = task
+        else:
+            _queued[table] = task
+    await asyncio.shield(task)
+
+
+async def table_version(db: AsyncSession, table: str) -> int:
+    version = await db.scalar(select(TableVersion.version).where(TableVersion.name == table))
+    return version or 0
+
+
+async def table_etag(db: AsyncSession, table: str, request: Request) -> str:
+    """
+    Weak ETag for a read of ``table`` shaped by the request's query string.
+    Costs one primary-key lookup; the data itself is not read.
+    """
+    version = await table_version(db, table)
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.sha1(f"{table}|{version}|{request.url.path}|{query}".encode())
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # If-None-Match uses the weak comparison (RFC 9110 13.1.2)
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def conditional_hit(request: Request, etag: str) -> bool:
+    """
+    ``etag_matches`` for handlers. False while ``cached`` renders the response
+    for the cache, which needs the full body; the 304 is answered from there.
+    """
+    if getattr(request.state, "render_for_cache", False):
+        return False
+    return etag_matches(request, etag)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
@@ -0,0 +1,83 @@
+# metrics.py
+import bisect
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Default latency buckets, in seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values (Prometheus semantics)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets: List[float] = sorted(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + [float("inf")], self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else repr(bound)] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class HistogramFamily:
+    """One histogram per label combination, exported under a single metric name."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = buckets
+        self._children: Dict[Tuple, Histogram] = {}
+
+    def labels(self, *values) -> Histogram:
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = Histogram(self.buckets)
+        return child
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, histogram in self._children.items():
+            lines.extend(expose_histogram(self.name, histogram, self.label_names, values))
+        return lines
+
+
+def expose_histogram(name: str, histogram: Histogram, label_names: Sequence[str] = (), values: Sequence = ()) -> List[str]:
+    """Prometheus text lines for one histogram's buckets, sum and count."""
+    snapshot = histogram.snapshot()
+    lines = []
+    for bound, count in snapshot["buckets"].items():
+        le = f'le="{bound}"'
+        lines.append(f"{name}_bucket{_labels(label_names, values, le)} {count}")
+    lines.append(f"{name}_sum{_labels(label_names, values)} {snapshot['sum']}")
+    lines.append(f"{name}_count{_labels(label_names, values)} {snapshot['count']}")
+    return lines
+
+
+def expose_samples(name: str, kind: str, help: str, samples: Iterable[Tuple[Dict[str, object], float]]) -> List[str]:
+    """Prometheus text lines for a gauge or counter given ``(labels, value)`` pairs."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {float(value)}")
+    return lines
@@ -1,45 +1,297 @@
 # pagination.py
+import asyncio
+import base64
+import binascii
+import json
+import time
+from contextlib import nullcontext
 from functools import wraps
-from fastapi import Query, Depends
+from fastapi import Query, HTTPException
 from pydantic import BaseModel
-from typing import Any, Tuple
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from app.core.config import settings
+from app.core.database import sibling_session
+
+# Sort key name -> ordered columns the page seeks on. The last column must be
+# unique (usually the primary key) so the ordering is total.
+SortKeys = Dict[str, Sequence[Any]]
+
+# How ``total`` is computed:
+#   exact     - COUNT(*) over the filtered query, after the page (alongside it
+#               with PAGINATION_PARALLEL_COUNT)
+#   estimated - planner row estimate (PostgreSQL), exact elsewhere
+#   cached    - exact count kept for PAGINATION_COUNT_CACHE_TTL seconds
+#   none      - no count, only ``has_more``
+COUNT_STRATEGIES = ("exact", "estimated", "cached", "none")
+
 
 class PaginationParams(BaseModel):
-    limit: int
-    offset: int
+    limit: int = 10
+    offset: int = 0
+    cursor: Optional[str] = None
+    sort: str = "id"
+    count: str = "exact"
+
 
 def pagination_params(
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor, overrides offset"),
+    sort: str = Query("id"),
+    count: str = Query("exact", pattern=f"^({'|'.join(COUNT_STRATEGIES)})$"),
 ):
-    return PaginationParams(limit=limit, offset=offset)
-
-def paginated(func):
-    @wraps(func)
-    async def wrapper(
-        *args,
-        pagination: PaginationParams = Depends(pagination_params),
-        **kwargs
-    ):
-        # Call the original function
-        result = await func(*args, **kwargs, pagination=pagination)
-        print('pagination: ',pagination)
-        if isinstance(result, tuple) and len(result) == 2:
-            items, total = result
-            
-            # Ensure items are serializable
-            if items and hasattr(items[0], 'dict'):
-                items = [item.dict() for item in items]
-            
-            return {
-                "items": items,
-                "pagination": {
-                    "total": total,
-                    "limit": pagination.limit,
-                    "offset": pagination.offset,
-                },
-            }
+    return PaginationParams(
+        limit=limit, offset=offset, cursor=cursor, sort=sort, count=count
+    )
+
+
+class CountCache:
+    """
+    Per-process TTL cache of exact counts, tagged by the tables a query reads.
+    Writers call ``invalidate(table_name)`` so cached totals never outlive a change.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, int, Tuple[str, ...]]] = {}
+
+    def get(self, key: str) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, total, _ = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return total
+
+    def set(self, key: str, total: int, tables: Sequence[str]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, total, tuple(tables))
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        if table is None:
+            self._entries.clear()
+            return
+        for key, (_, _, tables) in list(self._entries.items()):
+            if table in tables:
+                self._entries.pop(key, None)
+
+
+count_cache = CountCache(ttl=settings.PAGINATION_COUNT_CACHE_TTL)
+
+
+def encode_cursor(sort: str, direction: str, values: Sequence[Any]) -> str:
+    raw = json.dumps({"s": sort, "d": direction, "v": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, List[Any]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort, direction, values = data["s"], data["d"], data["v"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if direction not in ("next", "prev") or not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return sort, direction, values
+
+
+def cursor_values(columns: Sequence[Any], values: List[Any]) -> List[Any]:
+    """
+    Check a decoded cursor's key values against the sort columns' types, so
+    a tampered cursor is a 400 rather than a database error or empty page.
+    """
+    if len(values) != len(columns):
+        raise HTTPException(status_code=400, detail="Cursor does not match sort")
+    for column, value in zip(columns, values):
+        try:
+            expected = column.type.python_type
+        except NotImplementedError:
+            continue
+        if expected is float:
+            expected = (int, float)
+        if (isinstance(value, bool) and expected is not bool) or not isinstance(value, expected):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _count_query(query: Select) -> Select:
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+def _count_session(db: AsyncSession):
+    # With PAGINATION_PARALLEL_COUNT the count gets a separate connection so it
+    # can run alongside the page query (an AsyncSession cannot execute two
+    # statements at once); each such request then holds two pooled connections
+    if settings.PAGINATION_PARALLEL_COUNT:
+        return sibling_session(db)
+    return nullcontext(db)
+
+
+async def _exact_count(db: AsyncSession, query: Select) -> int:
+    async with _count_session(db) as count_db:
+        return (await count_db.execute(_count_query(query))).scalar_one()
+
+
+async def _estimated_count(db: AsyncSession, query: Select) -> int:
+    dialect = db.bind.dialect
+    if dialect.name != "postgresql":
+        return await _exact_count(db, query)
+    compiled = query.order_by(None).compile(
+        dialect=dialect, compile_kwargs={"literal_binds": True}
+    )
+    async with _count_session(db) as count_db:
+        # Sent to the driver as is: through text() a ":name" inside a literal
+        # (say, a search term) would be parsed as a bind parameter. Bound to
+        # ``query`` so it is routed like the read it explains
+        conn = await count_db.connection(bind_arguments={"clause": query})
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+        plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _cached_count(db: AsyncSession, query: Select) -> int:
+    compiled = query.order_by(None).compile()
+    key = f"{compiled}|{sorted(compiled.params.items())!r}"
+    total = count_cache.get(key)
+    if total is None:
+        total = await _exact_count(db, query)
+        tables = [t.name for t in query.get_final_froms() if hasattr(t, "name")]
+        count_cache.set(key, total, tables)
+    return total
+
+
+COUNTERS = {
+    "exact": _exact_count,
+    "estimated": _estimated_count,
+    "cached": _cached_count,
+}
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    pagination: PaginationParams,
+    sort_keys: SortKeys,
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Run ``query`` as one page and return ``(items, page_info)``.
+
+    Offset mode is used unless ``pagination.cursor`` is set, in which case the
+    page seeks past the cursor's key values instead of scanning ``OFFSET`` rows.
+    Both modes return ``next_cursor``/``prev_cursor`` so clients can switch,
+    unless ``query`` carries its own ordering, which cursors cannot resume.
+    ``total`` follows ``pagination.count`` (see ``COUNT_STRATEGIES``).
+    """
+    if pagination.sort not in sort_keys:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort, expected one of: {', '.join(sort_keys)}",
+        )
+    columns = list(sort_keys[pagination.sort])
+    key = tuple_(*columns) if len(columns) > 1 else columns[0]
+
+    # Keyset seeks only work when the sort key is the whole ordering; queries
+    # with their own (e.g. ranked search) get offset paging and no cursors
+    cursors_supported = not query._order_by_clauses
+
+    direction = "next"
+    if pagination.cursor:
+        sort, direction, values = decode_cursor(pagination.cursor)
+        if sort != pagination.sort:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort")
+        values = cursor_values(columns, values)
+        if not cursors_supported:
+            raise HTTPException(
+                status_code=400, detail="Cursor pagination is not supported for this ordering"
+            )
+
+    # Key values are selected alongside each row to build the cursors
+    page_query = query.add_columns(*[col.label(f"_key_{i}") for i, col in enumerate(columns)])
+
+    if pagination.cursor:
+        bound = tuple_(*values) if len(columns) > 1 else values[0]
+        if direction == "next":
+            page_query = page_query.where(key > bound).order_by(*columns)
         else:
-            return result
-    
-    return wrapper
\ No newline at end of file
+            page_query = page_query.where(key < bound).order_by(*[c.desc() for c in columns])
+    else:
+        page_query = page_query.order_by(*columns).offset(pagination.offset)
+
+    # Fetch one extra row to know whether another page exists
+    page_query = page_query.limit(pagination.limit + 1)
+    counter = COUNTERS.get(pagination.count)
+    if counter is None:
+        total = None
+        rows = (await db.execute(page_query)).all()
+    elif settings.PAGINATION_PARALLEL_COUNT:
+        total, result = await asyncio.gather(
+            counter(db, query), db.execute(page_query)
+        )
+        rows = result.all()
+    else:
+        rows = (await db.execute(page_query)).all()
+        total = await counter(db, query)
+    has_more = len(rows) > pagination.limit
+    rows = rows[: pagination.limit]
+    if direction == "prev":
+        rows.reverse()
+
+    key_count = len(columns)
+    descriptions = query.column_descriptions
+    if len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]:
+        # Whole-entity select: hand back the ORM objects
+        items = [row[0] for row in rows]
+    else:
+        # Column projection: plain dicts, no identity-map bookkeeping
+        names = [description["name"] for description in descriptions]
+        items = [dict(zip(names, row)) for row in rows]
+    first_key = list(rows[0][-key_count:]) if rows and cursors_supported else None
+    last_key = list(rows[-1][-key_count:]) if rows and cursors_supported else None
+
+    if direction == "next":
+        has_next = has_more
+        has_prev = bool(pagination.cursor) or pagination.offset > 0
+    else:
+        has_next = True
+        has_prev = has_more
+
+    return items, {
+        "total": total,
+        "limit": pagination.limit,
+        "offset": pagination.offset,
+        "has_more": has_next,
+        "next_cursor": encode_cursor(pagination.sort, "next", last_key) if last_key and has_next else None,
+        "prev_cursor": encode_cursor(pagination.sort, "prev", first_key) if first_key and has_prev else None,
+    }
+
+
+def paginated(sort_keys: SortKeys):
+    """
+    Turn a query builder into a paginated fetch.
+
+    The decorated coroutine receives ``db`` first and returns a ``Select``;
+    callers get back ``(items, page_info)`` as produced by :func:`paginate`.
+    """
+
+    def decorator(build_query):
+        @wraps(build_query)
+        async def wrapper(
+            db: AsyncSession,
+            *args,
+            pagination: Optional[PaginationParams] = None,
+            **kwargs
+        ):
+            pagination = pagination or PaginationParams()
+            query = await build_query(db, *args, **kwargs)
+            return await paginate(db, query, pagination, sort_keys)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,143 @@
+# queries.py
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import timing
+from app.core.config import settings
+from app.core.metrics import HistogramFamily
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text written to the slow-query and N+1 logs
+MAX_LOGGED_STATEMENT = 1000
+
+QUERIES_PER_REQUEST = HistogramFamily(
+    "http_request_queries",
+    "SQL statements executed per request.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+# Route template -> requests flagged with repeated identical statements
+n_plus_one_requests: Counter = Counter()
+slow_queries = 0
+
+
+class QueryLog:
+    """
+    Statements executed on behalf of one request or one ``count_queries``
+    block. Logs nest: a statement is recorded in the current log and all of
+    its parents, so a test can count around a request the app also counts.
+    """
+
+    __slots__ = ("count", "seconds", "statements", "parent")
+
+    def __init__(self, parent: Optional["QueryLog"] = None):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+        self.parent = parent
+
+    def record(self, statement: str, seconds: float) -> None:
+        log = self
+        while log is not None:
+            log.count += 1
+            log.seconds += seconds
+            log.statements[statement] += 1
+            log = log.parent
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements issued at least ``threshold`` times, most frequent first."""
+        return [(s, n) for s, n in self.statements.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+
+def begin_request() -> Tuple[QueryLog, Token]:
+    log = QueryLog(parent=_current.get())
+    return log, _current.set(log)
+
+
+def end_request(log: QueryLog, token: Token, route: str) -> None:
+    _current.reset(token)
+    QUERIES_PER_REQUEST.labels(route).observe(log.count)
+    threshold = settings.DB_N_PLUS_ONE_THRESHOLD
+    if threshold > 0:
+        repeated = log.repeated(threshold)
+        if repeated:
+            n_plus_one_requests[route] += 1
+            statement, times = repeated[0]
+            logger.warning(
+                "possible N+1 on %s: %d queries, statement repeated %d times: %s",
+                route, log.count, times, statement[:MAX_LOGGED_STATEMENT],
+            )
+
+
+def redact(parameters, executemany: bool) -> str:
+    # Values never reach the log, only their shape
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return repr({key: type(value).__name__ for key, value in parameters.items()})
+    if isinstance(parameters, (list, tuple)):
+        return repr([type(value).__name__ for value in parameters])
+    return "<redacted>"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement on ``engine``: counted in the current query log,
+    added to the request's ``db`` phase, and logged with redacted parameters
+    when slower than DB_SLOW_QUERY_MS.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        global slow_queries
+        elapsed = time.perf_counter() - context._query_started
+        timing.add("db", elapsed)
+        log = _current.get()
+        if log is not None:
+            log.record(statement, elapsed)
+        if settings.DB_SLOW_QUERY_MS and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+            slow_queries += 1
+            logger.warning(
+                "slow query %.1f ms: %s params=%s",
+                elapsed * 1000, statement[:MAX_LOGGED_STATEMENT], redact(parameters, executemany),
+            )
+
+
+@contextmanager
+def count_queries():
+    """Collect the statements run inside the block (including by in-process ASGI requests)."""
+    log, token = begin_request()
+    try:
+        yield log
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """
+    Fail if the block runs more than ``limit`` statements::
+
+        with assert_max_queries(3):
+            await client.get("/api/v1/users/")
+    """
+    with count_queries() as log:
+        yield log
+    if log.count > limit:
+        listing = "\n".join(f"  {n}x {s[:200]}" for s, n in log.statements.most_common())
+        raise AssertionError(f"expected at most {limit} queries, got {log.count}:\n{listing}")
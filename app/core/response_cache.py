@@ -0,0 +1,320 @@
+# response_cache.py
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import orjson
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.etag import etag_matches, not_modified
+
+# Response headers kept with a cached body; content-length is recomputed
+STORED_HEADERS = ("content-type", "etag", "cache-control", "vary")
+
+
+class CachedResponse:
+    """A rendered 200 response: body bytes plus the headers worth replaying."""
+
+    __slots__ = ("status_code", "headers", "body", "stored_at")
+
+    def __init__(self, status_code: int, headers: List[Tuple[str, str]], body: bytes, stored_at: float):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+
+    @classmethod
+    def from_response(cls, response: Response) -> Optional["CachedResponse"]:
+        # Streaming responses have no rendered body to keep
+        if response.status_code != 200 or not hasattr(response, "body"):
+            return None
+        headers = [(k, v) for k, v in response.headers.items() if k in STORED_HEADERS]
+        return cls(response.status_code, headers, response.body, time.time())
+
+    def to_response(self, outcome: str) -> Response:
+        response = Response(content=self.body, status_code=self.status_code, headers=dict(self.headers))
+        response.headers["X-Cache"] = outcome
+        response.headers["Age"] = str(max(int(time.time() - self.stored_at), 0))
+        return response
+
+    def dumps(self) -> bytes:
+        meta = {"s": self.status_code, "h": self.headers, "t": self.stored_at}
+        return orjson.dumps(meta) + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CachedResponse":
+        meta, _, body = raw.partition(b"\n")
+        meta = orjson.loads(meta)
+        return cls(meta["s"], [tuple(h) for h in meta["h"]], body, meta["t"])
+
+
+class LocalBackend:
+    """In-process LRU; each worker keeps its own entries and tag versions."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._tag_versions: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, response: CachedResponse, ttl: float) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        return [self._tag_versions.get(tag, 0) for tag in tags]
+
+    async def bump(self, tags: Sequence[str]) -> None:
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    async def acquire(self, key: str, timeout: float) -> bool:
+        # Concurrent misses in this process are already coalesced
+        return True
+
+    async def release(self, key: str) -> None:
+        pass
+
+    async def locked(self, key: str) -> bool:
+        return False
+
+    async def close(self) -> None:
+        pass
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Shared cache for multi-worker deployments. ``client`` may be any object
+    with the redis.asyncio API (get/set/mget/incr/delete/exists), e.g. a local
+    stand-in in tests; otherwise one is created from ``url``.
+    """
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = "response-cache:"):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self.client.get(self.prefix + key)
+        return CachedResponse.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, response: CachedResponse, ttl: float) -> None:
+        await self.client.set(self.prefix + key, response.dumps(), px=int(ttl * 1000))
+
+    async def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        values = await self.client.mget([f"{self.prefix}tag:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    async def bump(self, tags: Sequence[str]) -> None:
+        for tag in tags:
+            await self.client.incr(f"{self.prefix}tag:{tag}")
+
+    async def acquire(self, key: str, timeout: float) -> bool:
+        # One worker recomputes; the lock expires if that worker dies
+        locked = await self.client.set(f"{self.prefix}lock:{key}", b"1", nx=True, px=int(timeout * 1000))
+        return bool(locked)
+
+    async def release(self, key: str) -> None:
+        await self.client.delete(f"{self.prefix}lock:{key}")
+
+    async def locked(self, key: str) -> bool:
+        return bool(await self.client.exists(f"{self.prefix}lock:{key}"))
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class ResponseCache:
+    """
+    Cache of rendered GET responses.
+
+    Keys hash the path, the sorted query string, the current version of each
+    tag and optionally the caller's role or id. Invalidating a tag bumps its
+    version, so every key built on the old version stops matching at once,
+    in every worker that shares the backend.
+
+    Concurrent misses for one key are coalesced: a single request recomputes
+    while the others wait for its result (across workers via the backend lock).
+    """
+
+    def __init__(self, backend, ttl: float, lock_timeout: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def key_for(self, request: Request, tags: Sequence[str], vary: Optional[str] = None) -> str:
+        versions = await self.backend.tag_versions(tags)
+        parts = [
+            request.url.path,
+            sorted(request.query_params.multi_items()),
+            list(zip(tags, versions)),
+        ]
+        principal = getattr(request.state, "principal", None)
+        if vary == "role":
+            parts.append(principal.role.value if principal else None)
+        elif vary == "principal":
+            parts.append(principal.id if principal else None)
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    async def invalidate(self, tags: Sequence[str]) -> None:
+        await self.backend.bump(tags)
+
+    async def _wait_for_other_worker(self, key: str) -> Optional[CachedResponse]:
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            entry = await self.backend.get(key)
+            if entry is not None:
+                return entry
+            if not await self.backend.locked(key):
+                # Released without storing (not cacheable, or it failed)
+                return None
+        return None
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[Response]], ttl: Optional[float] = None
+    ) -> Tuple[Union[Response, CachedResponse], str]:
+        """
+        Return ``(result, outcome)``: the stored entry and ``HIT``, or the freshly
+        computed response and ``MISS``.
+        """
+        entry = await self.backend.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry, "HIT"
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            entry = await asyncio.shield(inflight)
+            if entry is not None:
+                self.coalesced += 1
+                return entry, "HIT"
+            # The leader's response was not cacheable: compute our own
+            self.misses += 1
+            return await compute(), "MISS"
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        entry = None
+        locked = False
+        try:
+            locked = await self.backend.acquire(key, self.lock_timeout)
+            if not locked:
+                entry = await self._wait_for_other_worker(key)
+                if entry is not None:
+                    self.coalesced += 1
+                    return entry, "HIT"
+            response = await compute()
+            entry = CachedResponse.from_response(response)
+            if entry is not None:
+                await self.backend.set(key, entry, ttl or self.ttl)
+            return response, "MISS"
+        finally:
+            future.set_result(entry)
+            self._inflight.pop(key, None)
+            if locked:
+                await self.backend.release(key)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": type(self.backend).__name__,
+            "size": self.backend.size(),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+def _build_backend():
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisBackend(settings.RESPONSE_CACHE_REDIS_URL)
+    return LocalBackend(settings.RESPONSE_CACHE_SIZE)
+
+
+response_cache = ResponseCache(
+    backend=_build_backend(),
+    ttl=settings.RESPONSE_CACHE_TTL,
+    lock_timeout=settings.RESPONSE_CACHE_LOCK_TIMEOUT,
+)
+
+
+def cached(tags: Sequence[str], ttl: Optional[float] = None, vary: Optional[str] = None):
+    """
+    Cache a GET route's rendered 200 responses under ``tags``.
+
+    ``vary`` is ``None`` (shared by every caller), ``"role"`` or
+    ``"principal"``; the latter two need ``@permissions`` above this decorator.
+    Responses carry ``X-Cache: HIT|MISS`` and ``Age``.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, request: Request, **kwargs):
+            if response_cache.ttl <= 0:
+                return await func(*args, request=request, **kwargs)
+
+            async def render():
+                # The stored entry must be a full 200 even when this caller
+                # could get a 304; see conditional_hit
+                request.state.render_for_cache = True
+                try:
+                    return await func(*args, request=request, **kwargs)
+                finally:
+                    request.state.render_for_cache = False
+
+            key = await response_cache.key_for(request, tags, vary)
+            result, outcome = await response_cache.get_or_compute(key, render, ttl)
+            if not isinstance(result, (CachedResponse, Response)):
+                return result
+
+            headers = dict(result.headers) if isinstance(result, CachedResponse) else result.headers
+            etag = headers.get("etag")
+            if result.status_code == 200 and etag and etag_matches(request, etag):
+                response = not_modified(etag)
+                response.headers["X-Cache"] = outcome
+                return response
+            if isinstance(result, CachedResponse):
+                return result.to_response(outcome)
+            result.headers["X-Cache"] = outcome
+            return result
+
+        return wrapper
+
+    return decorator
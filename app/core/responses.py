@@ -0,0 +1,14 @@
+# responses.py
+from typing import Any
+
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+from app.core.timing import timed
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """orjson response whose encode time is reported as the ``serialize`` phase."""
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return super().render(content)
@@ -0,0 +1,57 @@
+# search.py
+from sqlalchemy import case, func, literal, or_
+from sqlalchemy.sql import Select
+from typing import Any, Sequence
+
+# prefix    - matches values starting with the term
+# substring - matches the term anywhere in the value
+# ranked    - substring matches, best matches first
+SEARCH_MODES = ("prefix", "substring", "ranked")
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def apply_search(
+    query: Select,
+    columns: Sequence[Any],
+    term: str,
+    mode: str = "substring",
+    dialect: str = "postgresql",
+) -> Select:
+    """
+    Filter ``query`` to rows where any of ``columns`` matches ``term``.
+
+    On PostgreSQL the ILIKE patterns are served by the pg_trgm GIN indexes and
+    ``ranked`` orders by trigram similarity. Other databases (SQLite in tests)
+    get the same filters and a simple exact > prefix > substring ranking.
+    """
+    term = term.strip()
+    if not term:
+        return query
+
+    escaped = escape_like(term)
+    pattern = f"{escaped}%" if mode == "prefix" else f"%{escaped}%"
+    query = query.where(or_(*[col.ilike(pattern, escape="\\") for col in columns]))
+
+    if mode != "ranked":
+        return query
+
+    if dialect == "postgresql":
+        rank = func.greatest(*[func.similarity(col, term) for col in columns])
+        return query.order_by(rank.desc())
+
+    lowered = term.lower()
+    rank = func.min(
+        *[
+            case(
+                (func.lower(col) == lowered, 0),
+                (func.lower(col).like(f"{escape_like(lowered)}%", escape="\\"), 1),
+                else_=2,
+            )
+            for col in columns
+        ],
+        literal(2),
+    )
+    return query.order_by(rank)
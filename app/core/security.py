@@ -1,12 +1,23 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import timedelta, datetime
-from typing import Optional
+from typing import Optional, Tuple
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from app.core.config import settings
+from app.core.metrics import Histogram
+from app.core import timing
 
 # define a password hasing context (bcrypt hashing)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with fewer rounds than BCRYPT_ROUNDS are flagged for rehash on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 # JWT Token Settings
 ALGORITHM = "HS256"
@@ -15,7 +26,6 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 100  # Settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
 # Function to hash a password
 def hash_password(password: str) -> str:
-    print(password)
     return pwd_context.hash(password)
 
 
@@ -24,17 +34,184 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+# Function to verify a password and return a new hash if its cost is outdated
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop on a thread or process pool.
+
+    At most ``max_concurrency`` hashes run at once; further callers wait on a
+    semaphore, and the wait is recorded so queueing shows up in ``stats()``.
+    """
+
+    def __init__(self, executor: str = "thread", workers: int = 0, max_concurrency: int = 0):
+        self.executor_kind = executor
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.queued = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        queued_at = time.perf_counter()
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        started_at = time.perf_counter()
+        wait = started_at - queued_at
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_run += time.perf_counter() - started_at
+            self._semaphore.release()
+            timing.add("hash", time.perf_counter() - queued_at)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "completed": self.completed,
+            "avg_wait_ms": self.total_wait / self.completed * 1000 if self.completed else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+            "avg_run_ms": self.total_run / self.completed * 1000 if self.completed else 0.0,
+        }
+
+
+password_hasher = PasswordHasher(
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+)
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified JWT payloads keyed by the token's SHA-256
+    digest. A repeated bearer token skips signature verification until its
+    ``exp``; the raw token is never stored.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.decode_time = Histogram()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        payload = self._entries.get(key)
+        if payload is None:
+            self.misses += 1
+            return None
+        if payload.get("exp", 0) <= time.time():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def set(self, key: bytes, payload: dict) -> None:
+        # Tokens without an expiry are never cached
+        if self.maxsize <= 0 or "exp" not in payload:
+            return
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "decode_seconds": self.decode_time.snapshot(),
+        }
+
+
+token_cache = VerifiedTokenCache(maxsize=settings.TOKEN_CACHE_SIZE)
+
+
 # Function for verify a JWT Token
 def verify_token(token: str):
+    key = token_cache.digest(token)
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    started = time.perf_counter()
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e),
             headers={"www-Authentication": "Bearer"},
         )
+    finally:
+        token_cache.decode_time.observe(time.perf_counter() - started)
+
+    token_cache.set(key, payload)
+    return payload
 
 
 # Function to create JWT token (access token )
@@ -0,0 +1,112 @@
+# startup.py
+import logging
+import asyncio
+import time
+from typing import Set
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.database import async_engine, async_session_factory, create_db_and_tables, replicas
+from app.core.etag import table_version
+from app.core.pagination import PaginationParams
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# verify - refuse to start unless the database is at the Alembic head
+# warn   - log the mismatch and start anyway
+# create - create_all, for throwaway databases without migrations (tests, demos)
+# off    - trust the deploy; no schema work at all
+SCHEMA_CHECKS = ("verify", "warn", "create", "off")
+
+
+def alembic_heads() -> Set[str]:
+    # Imported here: Alembic is only needed for this one check
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(Config(settings.ALEMBIC_CONFIG)).get_heads())
+
+
+async def database_revisions(engine: AsyncEngine = async_engine) -> Set[str]:
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except DBAPIError:
+            # No alembic_version table: never migrated
+            return set()
+        return set(result.scalars().all())
+
+
+async def check_schema(mode: str) -> None:
+    heads = alembic_heads()
+    current = await database_revisions()
+    if current == heads:
+        return
+    message = (
+        f"database is at revision {', '.join(sorted(current)) or 'none'} but the code "
+        f"expects {', '.join(sorted(heads))}; run `alembic upgrade head`"
+    )
+    if mode == "verify":
+        raise RuntimeError(message)
+    logger.warning(message)
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> int:
+    """Open ``connections`` connections at once so they idle in the pool."""
+    pool_size = getattr(engine.pool, "size", lambda: 1)()
+    count = min(connections or pool_size, pool_size)
+
+    async def open_one():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(open_one() for _ in range(count)))
+    return count
+
+
+async def warm_statements() -> None:
+    """
+    Run the statements nearly every request starts with, so their compiled
+    forms are cached (and mappers configured) before traffic arrives.
+    """
+    from app.services.user_service import get_users
+
+    for use_primary in ([True, False] if replicas.engines else [True]):
+        async with async_session_factory(info={"use_primary": use_primary}) as db:
+            # Principal lookup of the permission check
+            await db.execute(select(User).where(User.id == 0))
+            await table_version(db, User.__tablename__)
+            await get_users(db, pagination=PaginationParams())
+
+
+async def run_startup() -> dict:
+    """Schema check and warm-up; returns the seconds each step took."""
+    mode = settings.STARTUP_SCHEMA_CHECK
+    report = {"schema_check": mode}
+
+    started = time.perf_counter()
+    if mode in ("verify", "warn"):
+        await check_schema(mode)
+    elif mode == "create":
+        await create_db_and_tables()
+    report["schema_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    report["warm_connections"] = await warm_pool(async_engine, settings.STARTUP_WARM_CONNECTIONS)
+    for engine in replicas.engines:
+        await warm_pool(engine, settings.STARTUP_WARM_CONNECTIONS)
+    report["pool_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if settings.STARTUP_WARM_STATEMENTS:
+        try:
+            await warm_statements()
+        except DBAPIError as exc:
+            # A cold cache is no reason to refuse traffic
+            logger.warning("statement warm-up failed: %s", exc.orig)
+    report["statements_seconds"] = time.perf_counter() - started
+    return report
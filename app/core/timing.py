@@ -0,0 +1,62 @@
+# timing.py
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Optional, Tuple
+
+from app.core.metrics import HistogramFamily
+
+# Phase name -> seconds spent in it, for the request being served. Child
+# tasks and SQLAlchemy's greenlets inherit the context, so they add to the
+# same dict. Phases may nest (auth includes its own db time).
+_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_phases", default=None)
+
+REQUEST_DURATION = HistogramFamily(
+    "http_request_duration_seconds",
+    "Time from request start to the last body byte.",
+    ("method", "route", "status"),
+)
+PHASE_DURATION = HistogramFamily(
+    "http_request_phase_seconds",
+    "Time spent per request in each phase (auth, db, hash, serialize, envelope, compress).",
+    ("route", "phase"),
+)
+
+
+def begin_request() -> Tuple[Dict[str, float], Token]:
+    phases: Dict[str, float] = {}
+    return phases, _phases.set(phases)
+
+
+def end_request(token: Token) -> None:
+    _phases.reset(token)
+
+
+def add(phase: str, seconds: float) -> None:
+    phases = _phases.get()
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add(phase, time.perf_counter() - started)
+
+
+def server_timing(phases: Dict[str, float], total: float, queries: Optional[int] = None) -> str:
+    """``Server-Timing`` header value, durations in milliseconds."""
+    parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases.items()]
+    if queries:
+        parts.append(f'queries;desc="{queries}"')
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def observe(method: str, route: str, status: int, elapsed: float, phases: Dict[str, float]) -> None:
+    REQUEST_DURATION.labels(method, route, str(status)).observe(elapsed)
+    for name, seconds in phases.items():
+        PHASE_DURATION.labels(route, name).observe(seconds)
@@ -1,22 +1,49 @@
-from app.middlewares.response_middleware import ResponsePatternMiddleware
+import time
+
+# Measured from here: module imports are most of a worker's startup
+IMPORT_STARTED = time.perf_counter()
 
-# from app.middlewares.test_middleware import ProcessTimeMiddleware
+from app.middlewares.db_session_middleware import DBSessionMiddleware
+from app.middlewares.admission_middleware import AdmissionMiddleware
+from app.middlewares.response_middleware import ResponsePatternMiddleware
+from app.middlewares.compression_middleware import CompressionMiddleware
+from app.middlewares.timing_middleware import ServerTimingMiddleware
 from fastapi import FastAPI
-from app.core.database import create_db_and_tables
+from app.core.config import settings
+from app.core.admission import rate_limiter
+from app.core.database import dispose_engines
+from app.core.responses import ORJSONResponse
+from app.core.response_cache import response_cache
+from app.core.security import password_hasher
+from app.core.startup import run_startup
+from app.permissions.cache import principal_cache
 from contextlib import asynccontextmanager
 from app.api.v1 import api_router
+from app.api.metrics import router as metrics_router
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
 
 
-# Run database migrations automatically (useful for local dev, but handled by Docker in production)
+# Migrations run before the app (alembic upgrade head); startup only checks the
+# revision and warms the pool, see STARTUP_SCHEMA_CHECK
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Running startup tasks...")
-    await create_db_and_tables()  # Ensures tables are created
+    started = time.perf_counter()
+    report = await run_startup()
+    await principal_cache.start()  # Cross-worker invalidation listener, if configured
+    report["import_seconds"] = IMPORT_SECONDS
+    report["total_seconds"] = IMPORT_SECONDS + time.perf_counter() - started
+    app.state.startup = report
+    print(f"Ready in {report['total_seconds']:.3f}s: {report}")
     yield  # Yield control to FastAPI
     print("Shutting down...")  # Runs on shutdown (optional)
+    await principal_cache.stop()
+    await response_cache.close()
+    await rate_limiter.close()
+    password_hasher.shutdown()
+    await dispose_engines()  # Last: nothing uses the pool after this
 
 
 app = FastAPI(
@@ -26,12 +53,17 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse,  # orjson encodes ~10x faster than json.dumps
     default_skip=0,
     default_limit=100,
     max_limit=1000,
 )
 
 
+app.add_middleware(DBSessionMiddleware)
+# Inside CORS so browsers can read the 429/503; outside the session so shed
+# requests never touch the pool
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Or a list of your frontend domains
@@ -40,6 +72,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(ResponsePatternMiddleware)
+# Outermost: compresses the finished envelope
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+# Outside everything else so Server-Timing covers the whole stack
+app.add_middleware(ServerTimingMiddleware)
 """  """
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -76,9 +117,13 @@ app.openapi = custom_openapi
 """  """
 
 app.include_router(api_router, prefix="/api/v1")
+app.include_router(metrics_router)
 
 
 # Root endpoint
 @app.get("/", tags=["Root"])
 def root():
     return {"message": "Welcome to the Teacher Data Entry Portal API"}
+
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
@@ -0,0 +1,83 @@
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.admission import Overloaded, admission, rate_limiter, retry_after
+from app.core.config import settings
+
+# Never limited: probes, scrapes and the API docs
+EXEMPT_PATHS = {"/", "/metrics"}
+EXEMPT_PREFIXES = ("/api/docs", "/api/redoc", "/api/openapi.json")
+
+# Bounded memo of (method, path) -> route template; paths with ids are mostly unique
+MAX_MEMO = 4096
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware shedding load before a request reaches the
+    connection pool or the password hasher.
+
+    The route template is matched up front. The caller's token bucket for
+    that route is checked first (429 when empty), then the route's
+    concurrency gate is entered (503 when its wait queue is full or the wait
+    times out). Both carry ``Retry-After``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._templates = {}
+
+    def route_template(self, scope: Scope) -> str:
+        key = (scope["method"], scope["path"])
+        template = self._templates.get(key)
+        if template is None:
+            template = "unmatched"
+            for route in scope["app"].router.routes:
+                match, _ = route.matches(scope)
+                if match == Match.FULL:
+                    template = route.path
+                    break
+            if len(self._templates) >= MAX_MEMO:
+                self._templates.clear()
+            self._templates[key] = template
+        return f"{scope['method']} {template}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        route = self.route_template(scope)
+
+        if rate_limiter.enabled:
+            wait = await rate_limiter.check(scope, route)
+            if wait > 0:
+                response = JSONResponse(
+                    status_code=429,
+                    content={"detail": "Too many requests"},
+                    headers={"Retry-After": retry_after(wait)},
+                )
+                await response(scope, receive, send)
+                return
+
+        if not admission.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        gate = admission.gate(route)
+        try:
+            await gate.acquire()
+        except Overloaded:
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is busy, retry later"},
+                headers={"Retry-After": retry_after(settings.ADMISSION_RETRY_AFTER)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
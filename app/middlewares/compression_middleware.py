@@ -0,0 +1,198 @@
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.timing import timed
+from app.middlewares.response_middleware import NO_BODY_STATUS
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+
+# Types worth compressing; images, archives and other binary bodies are
+# already compressed and are sent as they are
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/javascript",
+    "application/xml",
+)
+
+
+def _is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith(("+json", "+xml"))
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """Best of ``br`` / ``gzip`` the client accepts, or ``""`` for identity."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_quality = "", 0.0
+    for coding in candidates:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class _Compressor:
+    """Incremental gzip or brotli stream; every chunk is flushed to the client."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits 31: zlib stream with a gzip header and trailer
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        with timed("compress"):
+            if self.encoding == "br":
+                return self._brotli.process(data) + self._brotli.flush()
+            return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        with timed("compress"):
+            if self.encoding == "br":
+                return self._brotli.process(data) + self._brotli.finish()
+            return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI gzip/brotli compression, meant to sit outside
+    ``ResponsePatternMiddleware`` so the finished envelope is compressed.
+
+    Bodies below ``minimum_size`` go out as they are. Streamed bodies are
+    buffered only until they reach ``minimum_size``, then compressed chunk
+    by chunk, so exports keep streaming.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-request ``send`` wrapper deciding whether and how to compress."""
+
+    def __init__(self, send: Send, encoding: str, options: CompressionMiddleware) -> None:
+        self._send = send
+        self.encoding = encoding
+        self.options = options
+        self.start_message: Message = None
+        self.passthrough = False
+        self.compressor: _Compressor = None
+        self.buffer = b""
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            status_code = message["status"]
+            if (
+                status_code in NO_BODY_STATUS
+                or status_code < 200
+                or "content-encoding" in headers
+                or not _is_compressible(headers.get("content-type", ""))
+            ):
+                self.passthrough = True
+                await self._send(message)
+                return
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            if more_body:
+                chunk = self.compressor.compress(body) if body else b""
+                if chunk:
+                    await self._send({"type": "http.response.body", "body": chunk, "more_body": True})
+            else:
+                await self._send({"type": "http.response.body", "body": self.compressor.finish(body)})
+            return
+
+        # Not decided yet: wait until the body is known to be big enough
+        self.buffer += body
+        if len(self.buffer) < self.options.minimum_size:
+            if more_body:
+                return
+            await self._send_start(compressed=False, length=len(self.buffer))
+            await self._send({"type": "http.response.body", "body": self.buffer})
+            return
+
+        self.compressor = _Compressor(
+            self.encoding, self.options.gzip_level, self.options.brotli_quality
+        )
+        buffered, self.buffer = self.buffer, b""
+        if not more_body:
+            payload = self.compressor.finish(buffered)
+            await self._send_start(compressed=True, length=len(payload))
+            await self._send({"type": "http.response.body", "body": payload})
+            return
+        await self._send_start(compressed=True, length=None)
+        await self._send(
+            {"type": "http.response.body", "body": self.compressor.compress(buffered), "more_body": True}
+        )
+
+    async def _send_start(self, compressed: bool, length) -> None:
+        headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        headers.add_vary_header("Accept-Encoding")
+        if compressed:
+            headers["content-encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # Same content, different bytes: only weakly equal
+                headers["etag"] = f"W/{etag}"
+        if length is None:
+            if "content-length" in headers:
+                del headers["content-length"]
+        elif compressed or "content-length" in headers:
+            headers["content-length"] = str(length)
+        self.start_message["headers"] = headers.raw
+        await self._send(self.start_message)
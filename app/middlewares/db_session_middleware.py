@@ -0,0 +1,27 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.database import READ_ONLY_METHODS, UnitOfWork
+
+
+class DBSessionMiddleware:
+    """
+    Attaches a lazy :class:`UnitOfWork` to ``request.state.db`` and closes it
+    once the response has been fully sent, so every request uses at most one
+    pooled connection and always returns it. GET/HEAD requests may read from
+    replicas.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        uow = UnitOfWork(read_only=scope["method"] in READ_ONLY_METHODS)
+        scope.setdefault("state", {})["db"] = uow
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await uow.close()
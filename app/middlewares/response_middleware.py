@@ -1,77 +1,52 @@
 
-import json
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
-from fastapi.exceptions import RequestValidationError
-from starlette.exceptions import HTTPException
-
-
-class ResponsePatternMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        # Skip middleware for OpenAPI/Swagger/Redoc endpoints
-        if request.url.path.startswith(
-            ("/api/docs", "/api/redoc", "/api/openapi.json")
-        ):
-            return await call_next(request)
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-        try:
-            response = await call_next(request)
+from app.core.timing import timed
 
-            # For streaming responses, we need to read the body
-            response_body = b""
-            async for chunk in response.body_iterator:
-                response_body += chunk
 
-            # Reset the body iterator
-            response.body_iterator = iter([response_body])
+# Envelope fragments spliced around the already-encoded body, so the payload
+# is serialized exactly once (by the route) instead of decoded + re-encoded.
+SUCCESS_PREFIX = b'{"success":true,"message":"Request successful.","response":'
+SUCCESS_SUFFIX = b',"errors":null}'
+FAILURE_PREFIX = b'{"success":false,"message":"Request failed.","response":null,"errors":'
+FAILURE_SUFFIX = b"}"
 
-            # Try JSON decode, fallback to text
-            try:
-                data = json.loads(response_body) if response_body else None
-            except Exception:
-                data = response_body.decode() if response_body else None
+# Responses that must not carry a body (RFC 9110)
+NO_BODY_STATUS = {204, 304}
 
-            # Decide success based on status_code
-            is_success = 200 <= response.status_code < 400
 
-            return JSONResponse(
-                status_code=response.status_code,
-                content={
-                    "success": is_success,
-                    "message": "Request successful." if is_success else "Request failed.",
-                    "response": data if is_success else None,
-                    "errors": None if is_success else data,
-                }
-            )
+class ResponsePatternMiddleware:
+    """
+    Pure ASGI middleware wrapping every JSON response in the
+    ``success/message/response/errors`` envelope.
 
+    Bodies are never buffered: the envelope prefix is sent in front of the
+    first chunk and the suffix after the last one, so streamed responses
+    flow through chunk by chunk.
+    """
 
-        except RequestValidationError as exc:
-            return JSONResponse(
-                status_code=422,
-                content={
-                    "success": False,
-                    "message": "Validation error.",
-                    "response": None,
-                    "errors": exc.errors(),
-                },
-            )
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        except HTTPException as exc:
-            return JSONResponse(
-                status_code=exc.status_code,
-                content={
-                    "success": False,
-                    "message": exc.detail,
-                    "response": None,
-                    "errors": {"type": "HTTPException", "detail": exc.detail},
-                },
-            )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        # Skip middleware for OpenAPI/Swagger/Redoc and Prometheus endpoints
+        if scope["path"].startswith(("/api/docs", "/api/redoc", "/api/openapi.json", "/metrics")):
+            await self.app(scope, receive, send)
+            return
 
+        responder = _EnvelopeResponder(send)
+        try:
+            await self.app(scope, receive, responder.send)
         except Exception as exc:
-            return JSONResponse(
+            if responder.started:
+                raise
+            response = JSONResponse(
                 status_code=500,
                 content={
                     "success": False,
@@ -80,3 +55,91 @@ class ResponsePatternMiddleware(BaseHTTPMiddleware):
                     "errors": {"type": type(exc).__name__, "detail": str(exc)},
                 },
             )
+            await response(scope, receive, send)
+
+
+class _EnvelopeResponder:
+    """Per-request ``send`` wrapper that splices the envelope around the body."""
+
+    def __init__(self, send: Send) -> None:
+        self._send = send
+        self.start_message: Message = None
+        self.started = False
+        self.passthrough = False
+        self.prefix = b""
+        self.suffix = b""
+        self.streaming = False
+        self.body_sent = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            headers = MutableHeaders(raw=list(message["headers"]))
+            content_type = headers.get("content-type", "")
+            if (
+                status_code in NO_BODY_STATUS
+                or status_code < 200
+                or "content-encoding" in headers
+                or not content_type.startswith("application/json")
+            ):
+                # No body, one already encoded that cannot be spliced, or a
+                # non-JSON body (CSV, NDJSON, files), even an empty one
+                self.passthrough = True
+                self.started = True
+                await self._send(message)
+                return
+
+            # Hold the start message until the first body chunk tells us
+            # whether this is a single-shot or a streamed body.
+            self.start_message = message
+            is_success = 200 <= status_code < 400
+            self.prefix = SUCCESS_PREFIX if is_success else FAILURE_PREFIX
+            self.suffix = SUCCESS_SUFFIX if is_success else FAILURE_SUFFIX
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if not more_body:
+                # Single-shot body: splice once and fix the content-length
+                await self._send_single(body)
+                return
+            self.streaming = True
+            headers = MutableHeaders(raw=list(self.start_message["headers"]))
+            if "content-length" in headers:
+                del headers["content-length"]
+            self.start_message["headers"] = headers.raw
+            await self._send(self.start_message)
+            await self._send(
+                {"type": "http.response.body", "body": self.prefix, "more_body": True}
+            )
+
+        if body:
+            self.body_sent = True
+        if more_body:
+            if body:
+                await self._send(
+                    {"type": "http.response.body", "body": body, "more_body": True}
+                )
+            return
+
+        tail = body if self.body_sent else b"null"
+        await self._send(
+            {"type": "http.response.body", "body": tail + self.suffix, "more_body": False}
+        )
+
+    async def _send_single(self, body: bytes) -> None:
+        with timed("envelope"):
+            payload = body or b"null"
+            content = self.prefix + payload + self.suffix
+            headers = MutableHeaders(raw=list(self.start_message["headers"]))
+            headers["content-length"] = str(len(content))
+            self.start_message["headers"] = headers.raw
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": content})
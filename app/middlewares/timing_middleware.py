@@ -0,0 +1,48 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import queries, timing
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request.
+
+    The phases recorded while handling the request (see ``app.core.timing``)
+    and its query count go out in a ``Server-Timing`` header. Durations and
+    query counts are aggregated per route template for ``/metrics``, and
+    requests repeating one statement are logged as likely N+1s.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        phases, token = timing.begin_request()
+        query_log, query_token = queries.begin_request()
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                elapsed = time.perf_counter() - started
+                headers.append("Server-Timing", timing.server_timing(phases, elapsed, query_log.count))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # Route templates keep the label set bounded; unmatched paths share one
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            timing.observe(scope["method"], template, status_code, time.perf_counter() - started, phases)
+            queries.end_request(query_log, query_token, template)
+            timing.end_request(token)
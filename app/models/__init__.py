@@ -1,4 +1,5 @@
 from .base import Base
 
 
-from .user import User
\ No newline at end of file
+from .user import User
+from .table_version import TableVersion
\ No newline at end of file
@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, String
+
+from app.models.base import Base
+
+
+class TableVersion(Base):
+    """
+    Change counter per table behind the ETags. Bumped after a write commits,
+    in a transaction of its own and coalesced per process (see
+    ``app.core.etag.bump_version``). It is eventually consistent: just after
+    a write a reader may still see the old version, and a failed bump is
+    only logged.
+    """
+
+    __tablename__ = "table_versions"
+
+    name = Column(String(63), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum
+from sqlalchemy import DDL, Column, Integer, String, Enum, Index, event
 from sqlalchemy.ext.declarative import declarative_base
 import enum
 from sqlalchemy.orm import validates, relationship
@@ -6,6 +6,15 @@ from sqlalchemy.orm import validates, relationship
 from app.models.base import Base
 
 
+# The trigram indexes below need pg_trgm before create_all builds them
+# (STARTUP_SCHEMA_CHECK=create, benchmarks); migrations create it themselves
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class UserRole(enum.Enum):
     SUPER_ADMIN = "super_admin"
     ADMIN = "admin"
@@ -14,6 +23,12 @@ class UserRole(enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Trigram indexes behind ILIKE search (pg_trgm, see migration 7c2f1e9a4b3d)
+        Index("ix_users_full_name_trgm", "full_name", postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        Index("ix_users_mobile_no_trgm", "mobile_no", postgresql_using="gin", postgresql_ops={"mobile_no": "gin_trgm_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     mobile_no = Column(String(14), unique=True, nullable=False)  # Required field
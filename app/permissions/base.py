@@ -5,8 +5,10 @@ from functools import wraps
 from typing import Callable, List, Type
 from jose import JWTError
 from app.core.security import verify_token
-from app.core.database import AsyncSessionLocal
+from app.core.database import get_unit_of_work
+from app.core.timing import timed
 from app.models.user import User, UserRole
+from app.permissions.cache import Principal, principal_cache
 
 
 class BasePermission:
@@ -33,36 +35,41 @@ def permissions(required: List[Type[BasePermission]]):
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(request: Request, *args, **kwargs):
-            auth_header = request.headers.get("Authorization")
-
-            if not auth_header or not auth_header.startswith("Bearer "):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Missing or Invalid Token",
-                )
-
-            token = auth_header.replace("Bearer ", "")
-            try:
-                payload = verify_token(token)
-                user_id = int(payload.get("sub"))
-            except (JWTError, ValueError, TypeError) as e:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail=str(e),
-                    headers={"www-Authenticate": "Bearer"},
-                )
-
-            db = AsyncSessionLocal()
-            try:
-                stmt = select(User).where(User.id == user_id)
-                result = await db.execute(stmt)
-                user = result.scalar_one_or_none()
-                if not user:
+            with timed("auth"):
+                auth_header = request.headers.get("Authorization")
+
+                if not auth_header or not auth_header.startswith("Bearer "):
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="Missing or Invalid Token",
+                    )
+
+                token = auth_header.replace("Bearer ", "")
+                try:
+                    payload = verify_token(token)
+                    user_id = int(payload.get("sub"))
+                except (JWTError, ValueError, TypeError) as e:
                     raise HTTPException(
                         status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="User not found",
+                        detail=str(e),
+                        headers={"www-Authenticate": "Bearer"},
                     )
 
+                user = principal_cache.get(user_id)
+                if user is None:
+                    # Same request-scoped session the handler and services use
+                    db = get_unit_of_work(request).session
+                    stmt = select(User).where(User.id == user_id)
+                    result = await db.execute(stmt)
+                    db_user = result.scalar_one_or_none()
+                    if not db_user:
+                        raise HTTPException(
+                            status_code=status.HTTP_401_UNAUTHORIZED,
+                            detail="User not found",
+                        )
+                    user = Principal.from_user(db_user)
+                    principal_cache.set(user)
+
                 for perm in required:
                     if not perm().has_permission(user):
                         raise HTTPException(
@@ -70,9 +77,8 @@ def permissions(required: List[Type[BasePermission]]):
                             detail="Permission Denied",
                         )
 
-                return await func(request, *args, **kwargs)
-            finally:
-                db.close()
+            request.state.principal = user
+            return await func(*args, request=request, **kwargs)
 
         return wrapper
 
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Fields whose change must drop a cached principal
+PRINCIPAL_FIELDS = ("role", "email", "mobile_no", "username")
+
+# pg_notify payloads must stay under 8000 bytes; longer id lists become "*"
+MAX_NOTIFY_PAYLOAD = 7900
+
+
+class Principal:
+    """Snapshot of the user fields the permission classes need."""
+
+    __slots__ = ("id", "role", "username", "email", "mobile_no")
+
+    def __init__(self, id: int, role: UserRole, username: str, email: str, mobile_no: str):
+        self.id = id
+        self.role = role
+        self.username = username
+        self.email = email
+        self.mobile_no = mobile_no
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            role=user.role,
+            username=user.username,
+            email=user.email,
+            mobile_no=user.mobile_no,
+        )
+
+
+class LocalBackend:
+    """Single-process deployments: nothing to tell other workers."""
+
+    async def start(self, cache: "PrincipalCache") -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, db: AsyncSession, user_ids: List[int]) -> None:
+        pass
+
+
+class PostgresNotifyBackend:
+    """
+    Keeps workers coherent through PostgreSQL LISTEN/NOTIFY.
+
+    ``publish`` issues ``pg_notify`` on the writer's session, so the message is
+    only delivered if that transaction commits. Every worker listens on a
+    dedicated asyncpg connection and evicts the ids it receives. If that
+    connection drops, the worker reconnects with backoff and flushes its
+    cache, since notifications sent in between were missed.
+    """
+
+    # Seconds between reconnect attempts, doubling up to the maximum
+    RECONNECT_DELAY = 1.0
+    MAX_RECONNECT_DELAY = 30.0
+
+    def __init__(self, dsn: str, channel: str = "principal_cache"):
+        self.dsn = dsn
+        self.channel = channel
+        self._conn = None
+        self._cache: Optional["PrincipalCache"] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            user_ids = [int(user_id) for user_id in payload.split(",")]
+        except ValueError:
+            self._cache.clear()
+            return
+        for user_id in user_ids:
+            self._cache.evict(user_id)
+
+    def _on_terminate(self, connection):
+        if self._stopping or connection is not self._conn:
+            return
+        logger.warning("principal cache listener on %s lost its connection, reconnecting", self.channel)
+        self._conn = None
+        self._cache.clear()
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(self.channel, self._on_notify)
+        conn.add_termination_listener(self._on_terminate)
+        self._conn = conn
+
+    async def _reconnect(self) -> None:
+        delay = self.RECONNECT_DELAY
+        while not self._stopping:
+            try:
+                await self._connect()
+            except Exception:
+                logger.warning(
+                    "principal cache listener reconnect failed, retrying in %.0fs", delay, exc_info=True
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+                continue
+            # Entries cached while disconnected may have missed an eviction
+            self._cache.clear()
+            logger.info("principal cache listener on %s reconnected", self.channel)
+            return
+
+    async def start(self, cache: "PrincipalCache") -> None:
+        self._cache = cache
+        self._stopping = False
+        await self._connect()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+    async def publish(self, db: AsyncSession, user_ids: List[int]) -> None:
+        # One notification per transaction, however many users changed
+        payload = ",".join(str(user_id) for user_id in user_ids)
+        if len(payload) > MAX_NOTIFY_PAYLOAD:
+            payload = "*"  # Listeners clear the whole cache
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": self.channel, "payload": payload},
+        )
+
+
+class PrincipalCache:
+    """
+    Bounded LRU of principals keyed by user id, each entry valid for ``ttl``
+    seconds. Saves the ``SELECT ... FROM users`` the permission check would
+    otherwise run on every protected request.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, backend=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend or LocalBackend()
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, principal: Principal) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def evict(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def invalidate(self, db: AsyncSession, user_ids: Iterable[int]) -> None:
+        """Drop ``user_ids`` here and on every other worker."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        for user_id in user_ids:
+            self.evict(user_id)
+        await self.backend.publish(db, user_ids)
+
+    async def start(self) -> None:
+        await self.backend.start(self)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _build_backend():
+    if settings.PRINCIPAL_CACHE_BACKEND == "postgres":
+        dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        return PostgresNotifyBackend(dsn)
+    return LocalBackend()
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    backend=_build_backend(),
+)
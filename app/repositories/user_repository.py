@@ -1,24 +1,51 @@
 
-from typing import Optional
-from sqlalchemy import select
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models import User
 from app.schemas.user import UserCreate
 
+# Dialects with INSERT ... ON CONFLICT DO NOTHING
+CONFLICT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
 class UserRepository:
     def __init__(self, db: Session):
         self.db = db
     
-    async def create_user(self, user_data: UserCreate, hashed_password: str) -> User:
-        
+    async def create_user(self, user_data: UserCreate, hashed_password: str) -> Optional[User]:
+        """
+        Inserts a user in one round trip. Returns None when the email, mobile
+        number or username is already taken. Does not commit.
+        """
         user_dict = user_data.model_dump()
         user_dict['password'] = hashed_password
-        
-        new_user = User(**user_dict)
-        self.db.add(new_user)
-        await self.db.commit()
-        await self.db.refresh(new_user)
-        return new_user
+        # Core/bulk inserts skip the ORM validator that syncs the username
+        user_dict['username'] = user_dict['mobile_no']
+
+        dialect = self.db.bind.dialect.name
+        if dialect in CONFLICT_INSERTS:
+            stmt = (
+                CONFLICT_INSERTS[dialect](User)
+                .values(**user_dict)
+                .on_conflict_do_nothing()
+                .returning(User)
+            )
+            result = await self.db.execute(stmt)
+            return result.scalar_one_or_none()
+
+        # Other databases: map the unique-constraint error instead
+        try:
+            async with self.db.begin_nested():
+                result = await self.db.execute(insert(User).values(**user_dict).returning(User))
+                return result.scalar_one()
+        except IntegrityError:
+            return None
     
 
     async def get_by_email_or_mobile(self, email: str, mobile_no: str) -> Optional[User]:
@@ -30,4 +57,93 @@ class UserRepository:
             (User.mobile_no == mobile_no)
         )
         result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
\ No newline at end of file
+        return result.scalar_one_or_none()
+
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        """
+        Fetches a user by username (unique, so served by its index).
+        """
+        stmt = select(User).where(User.username == username)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def set_password(self, user_id: int, hashed_password: str) -> None:
+        stmt = update(User).where(User.id == user_id).values(password=hashed_password)
+        await self.db.execute(stmt)
+
+
+    async def find_existing(
+        self, emails: Iterable[str], mobile_nos: Iterable[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Returns which of the given emails and mobile numbers are already taken,
+        in a single query.
+        """
+        emails, mobile_nos = list(emails), list(mobile_nos)
+        if not emails and not mobile_nos:
+            return set(), set()
+        stmt = select(User.email, User.mobile_no).where(
+            or_(User.email.in_(emails), User.mobile_no.in_(mobile_nos))
+        )
+        result = await self.db.execute(stmt)
+        rows = result.all()
+        return {row.email for row in rows}, {row.mobile_no for row in rows}
+
+    async def bulk_create_users(self, users: List[dict]) -> List[int]:
+        """
+        Inserts many users with batched multi-row INSERTs and returns their
+        ids in input order. Does not commit.
+        """
+        if not users:
+            return []
+        for user in users:
+            # Core inserts skip the ORM validator that syncs the username
+            user["username"] = user["mobile_no"]
+        stmt = insert(User).returning(User.id, sort_by_parameter_order=True)
+        result = await self.db.execute(stmt, users)
+        return list(result.scalars().all())
+
+    async def update_user(self, user_id: int, changes: dict) -> Optional[User]:
+        """
+        Applies ``changes`` with a single UPDATE ... RETURNING. Returns None if
+        the user does not exist. Does not commit.
+        """
+        if not changes:
+            return await self.get_by_id(user_id)
+        if "mobile_no" in changes:
+            # Core/bulk updates skip the ORM validator that syncs the username
+            changes = dict(changes, username=changes["mobile_no"])
+        stmt = update(User).where(User.id == user_id).values(**changes).returning(User)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def bulk_update_users(self, updates: List[dict]) -> None:
+        """
+        Bulk UPDATE by primary key: each dict holds ``id`` plus the changed
+        columns. Rows changing the same columns share one executemany.
+        """
+        if not updates:
+            return
+        for changes in updates:
+            if "mobile_no" in changes:
+                changes["username"] = changes["mobile_no"]
+        await self.db.execute(update(User), updates)
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        result = await self.db.execute(select(User).where(User.id == user_id))
+        return result.scalar_one_or_none()
+
+    async def get_by_ids(self, user_ids: List[int]) -> List[User]:
+        # Refresh identities already loaded (e.g. the caller's own row): a bulk
+        # UPDATE by primary key does not synchronize the session
+        result = await self.db.execute(
+            select(User).where(User.id.in_(user_ids)).execution_options(populate_existing=True)
+        )
+        users = {user.id: user for user in result.scalars().all()}
+        return [users[user_id] for user_id in user_ids if user_id in users]
+
+    async def existing_ids(self, user_ids: List[int]) -> Set[int]:
+        result = await self.db.execute(select(User.id).where(User.id.in_(user_ids)))
+        return set(result.scalars().all())
+
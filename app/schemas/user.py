@@ -18,6 +18,11 @@ class UserUpdate(BaseModel):
     role: Optional[str] = None
 
 
+class UserBatchUpdate(BaseModel):
+    id: int
+    changes: UserUpdate
+
+
 class UserResponse(UserBase):
     id: int
     username: str
@@ -27,12 +32,24 @@ class UserResponse(UserBase):
         from_attributes=True
 
 class PaginationInfo(BaseModel):
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+class UserListItem(BaseModel):
+    # Sparse fieldsets: only the requested fields are set
+    mobile_no: Optional[str] = None
+    email: Optional[str] = None
+    role: Optional[str] = None
+    id: Optional[int] = None
+    username: Optional[str] = None
+
 
 class PaginatedUsers(BaseModel):
-    items: List[UserResponse]
+    items: List[UserListItem]
     pagination: PaginationInfo
 
 class Token(BaseModel):
@@ -0,0 +1,88 @@
+"""
+Production entry point:
+
+    alembic upgrade head && python -m app.serve
+
+Runs app.main:app under uvicorn with SERVER_WORKERS processes (one per
+available CPU by default), uvloop and httptools when installed, and the
+keep-alive, backlog and graceful-shutdown settings from app.core.config.
+
+On SIGTERM each worker stops accepting connections, closes idle keep-alive
+connections and lets in-flight requests finish for up to
+SERVER_GRACEFUL_TIMEOUT seconds; then the lifespan shutdown disposes the
+engine. Every worker has its own connection pool, so the database sees up to
+workers x (pool_size + max_overflow) connections.
+
+For development use ``uvicorn app.main:app --reload`` (docker-compose does).
+"""
+import argparse
+import os
+from importlib.util import find_spec
+
+import uvicorn
+
+from app.core.config import settings
+
+APP = "app.main:app"
+
+
+def available_cpus() -> int:
+    # Honours CPU affinity (taskset, cpusets), unlike os.cpu_count()
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def event_loop() -> str:
+    return "uvloop" if find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if find_spec("httptools") else "h11"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the API with production settings.")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS, help="0 = one per CPU")
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument("--keepalive", type=int, default=settings.SERVER_KEEPALIVE_SECONDS)
+    parser.add_argument("--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_TIMEOUT)
+    parser.add_argument("--forwarded-allow-ips", default=settings.FORWARDED_ALLOW_IPS)
+    parser.add_argument("--access-log", action="store_true", default=settings.SERVER_ACCESS_LOG)
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    workers = args.workers or available_cpus()
+    loop, http = event_loop(), http_protocol()
+    print(
+        f"Serving {APP} on {args.host}:{args.port}: {workers} worker(s), {loop}/{http}, "
+        f"keep-alive {args.keepalive}s, backlog {args.backlog}, drain {args.graceful_timeout}s"
+    )
+    uvicorn.run(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=args.backlog,
+        timeout_keep_alive=args.keepalive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        # The client address (and so the rate-limit key) comes from
+        # X-Forwarded-For when the peer is a trusted proxy
+        proxy_headers=True,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+        access_log=args.access_log,
+        log_level=args.log_level,
+        # Clients see our responses, not the server's version
+        server_header=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+from fastapi import HTTPException
+
+from app.core.security import create_access_token, password_hasher
+from app.repositories.user_repository import UserRepository
+
+
+async def login(username: str, password: str, user_repo: UserRepository) -> dict:
+    user = await user_repo.get_by_username(username)
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid Credentials")
+
+    # bcrypt runs on the hashing pool, never on the event loop
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password)
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid Credentials")
+
+    # Cost parameters changed since this hash was made: upgrade it in place
+    if new_hash:
+        await user_repo.set_password(user.id, new_hash)
+
+    access_token = create_access_token(data={"sub": str(user.id)})
+    return {"access_token": access_token, "token_type": "bearer"}
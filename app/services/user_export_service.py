@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.search import apply_search
+from app.models.user import User
+from app.schemas.user import UserResponse
+from app.services.user_service import USER_SEARCH_COLUMNS
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Exported columns follow the public response schema (never the password)
+EXPORT_FIELDS = list(UserResponse.model_fields)
+
+
+def _plain(value):
+    return getattr(value, "value", value)
+
+
+async def export_users(
+    db: AsyncSession,
+    fmt: str = "ndjson",
+    search: Optional[str] = None,
+    search_mode: str = "substring",
+) -> AsyncIterator[bytes]:
+    """
+    Stream users as NDJSON or CSV chunks from a server-side cursor.
+
+    Rows are fetched ``USER_EXPORT_CHUNK_ROWS`` at a time as plain tuples, so
+    memory stays flat however large the table is. If the client disconnects
+    the generator is cancelled and the cursor is closed straight away.
+    """
+    query = select(*[getattr(User, field) for field in EXPORT_FIELDS]).order_by(User.id)
+    if search:
+        query = apply_search(
+            query, USER_SEARCH_COLUMNS, search, mode=search_mode, dialect=db.bind.dialect.name
+        )
+    chunk_rows = settings.USER_EXPORT_CHUNK_ROWS
+
+    result = await db.stream(query.execution_options(yield_per=chunk_rows))
+    try:
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            yield buffer.getvalue().encode()
+            async for rows in result.partitions(chunk_rows):
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([[_plain(value) for value in row] for row in rows])
+                yield buffer.getvalue().encode()
+        else:
+            async for rows in result.partitions(chunk_rows):
+                yield "".join(
+                    json.dumps(
+                        {field: _plain(value) for field, value in zip(EXPORT_FIELDS, row)},
+                        separators=(",", ":"),
+                    )
+                    + "\n"
+                    for row in rows
+                ).encode()
+    finally:
+        await result.close()
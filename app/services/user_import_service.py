@@ -0,0 +1,232 @@
+import asyncio
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator, List, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import UnitOfWork, on_commit
+from app.core.etag import bump_version
+from app.core.pagination import count_cache
+from app.core.response_cache import response_cache
+from app.core.security import password_hasher
+from app.models.user import User, UserRole
+from app.repositories.user_repository import UserRepository
+from app.schemas.user import UserCreate
+
+CSV_TYPES = ("text/csv",)
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed body into decoded lines without buffering it whole."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8-sig")
+    if pending:
+        yield pending.rstrip(b"\r").decode("utf-8-sig")
+
+
+class _LineFeed:
+    """Lines handed to ``csv.reader`` as it asks for them."""
+
+    def __init__(self):
+        self.lines = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, dict]]:
+    # The first record is the header; quoted fields may span lines
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header = None
+    row_no = 0
+    quotes = 0
+    async for line in iter_lines(chunks):
+        feed.lines.append(line + "\n")
+        quotes += line.count('"')
+        if quotes % 2:
+            # Inside a quoted field: the record goes on with the next line
+            continue
+        quotes = 0
+        values = next(reader)
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row_no += 1
+        yield row_no, dict(zip(header, values))
+
+    if feed.lines:
+        # The body ended inside a quoted field
+        row_no += 1
+        yield row_no, {"__error__": "Unterminated quoted field"}
+
+
+async def iter_ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, dict]]:
+    row_no = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            row = {"__error__": f"Invalid JSON: {e}"}
+        yield row_no, row if isinstance(row, dict) else {"__error__": "Expected a JSON object"}
+
+
+def rows_for_content_type(content_type: str, chunks: AsyncIterator[bytes]):
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in CSV_TYPES:
+        return iter_csv_rows(chunks)
+    if media_type in NDJSON_TYPES:
+        return iter_ndjson_rows(chunks)
+    raise HTTPException(
+        status_code=415, detail="Send text/csv or application/x-ndjson"
+    )
+
+
+class _ImportState:
+    def __init__(self):
+        self.report: List[dict] = []
+        self.created = 0
+        self.seen_emails = set()
+        self.seen_mobile_nos = set()
+
+    def fail(self, row_no: int, error) -> None:
+        self.report.append({"row": row_no, "success": False, "error": error})
+
+    def ok(self, row_no: int, user_id: int) -> None:
+        self.created += 1
+        self.report.append({"row": row_no, "success": True, "id": user_id})
+
+
+def _validate(row_no: int, raw: dict, state: _ImportState):
+    if "__error__" in raw:
+        state.fail(row_no, raw["__error__"])
+        return None
+    try:
+        user = UserCreate(**raw)
+    except ValidationError as e:
+        state.fail(row_no, e.errors(include_url=False, include_context=False))
+        return None
+    if user.role not in UserRole.__members__:
+        state.fail(row_no, f"Invalid role, expected one of: {', '.join(UserRole.__members__)}")
+        return None
+    return user
+
+
+async def _import_batch(
+    batch: List[Tuple[int, UserCreate]], user_repo: UserRepository, state: _ImportState
+) -> None:
+    # Duplicates inside this import
+    unique = []
+    for row_no, user in batch:
+        if user.email in state.seen_emails or user.mobile_no in state.seen_mobile_nos:
+            state.fail(row_no, "Duplicate email or mobile number in import")
+            continue
+        state.seen_emails.add(user.email)
+        state.seen_mobile_nos.add(user.mobile_no)
+        unique.append((row_no, user))
+
+    # One duplicate check against the table for the whole batch
+    taken_emails, taken_mobile_nos = await user_repo.find_existing(
+        [user.email for _, user in unique], [user.mobile_no for _, user in unique]
+    )
+    fresh = []
+    for row_no, user in unique:
+        if user.email in taken_emails or user.mobile_no in taken_mobile_nos:
+            state.fail(row_no, "User with this email or username already exists")
+        else:
+            fresh.append((row_no, user))
+    if not fresh:
+        return
+
+    # Hash in parallel; the hasher's semaphore bounds the concurrency
+    hashes = await asyncio.gather(*(password_hasher.hash(user.password) for _, user in fresh))
+    records = [
+        dict(user.model_dump(), password=hashed) for (_, user), hashed in zip(fresh, hashes)
+    ]
+
+    db = user_repo.db
+    try:
+        async with db.begin_nested():
+            ids = await user_repo.bulk_create_users(records)
+    except IntegrityError:
+        # A concurrent signup took one of the keys: retry row by row to find it
+        ids = []
+        for record in records:
+            try:
+                async with db.begin_nested():
+                    ids.extend(await user_repo.bulk_create_users([record]))
+            except IntegrityError:
+                ids.append(None)
+
+    for (row_no, _), user_id in zip(fresh, ids):
+        if user_id is None:
+            state.fail(row_no, "User with this email or username already exists")
+        else:
+            state.ok(row_no, user_id)
+
+
+async def _commit_batch(
+    batch: List[Tuple[int, UserCreate]], user_repo: UserRepository, uow: UnitOfWork, state: _ImportState
+) -> None:
+    created = state.created
+    await _import_batch(batch, user_repo, state)
+    if state.created > created:
+        # Per batch: a later batch failing must not leave these rows cached stale
+        db = user_repo.db
+        on_commit(db, lambda: bump_version(User.__tablename__))
+        on_commit(db, lambda: count_cache.invalidate(User.__tablename__))
+        on_commit(db, lambda: response_cache.invalidate([User.__tablename__]))
+    await uow.commit()
+
+
+async def import_users(
+    rows: AsyncIterator[Tuple[int, dict]], user_repo: UserRepository, uow: UnitOfWork
+) -> dict:
+    """
+    Validate, hash and insert users in batches of USER_IMPORT_BATCH_SIZE.
+    Each batch is committed through ``uow`` on its own, with its cache
+    invalidations, so a large import makes steady progress.
+    """
+    state = _ImportState()
+    batch: List[Tuple[int, UserCreate]] = []
+    total = 0
+
+    async for row_no, raw in rows:
+        total += 1
+        user = _validate(row_no, raw, state)
+        if user is not None:
+            batch.append((row_no, user))
+        if len(batch) >= settings.USER_IMPORT_BATCH_SIZE:
+            await _commit_batch(batch, user_repo, uow, state)
+            batch = []
+
+    if batch:
+        await _commit_batch(batch, user_repo, uow, state)
+
+    state.report.sort(key=lambda item: item["row"])
+    return {
+        "total": total,
+        "created": state.created,
+        "failed": total - state.created,
+        "rows": state.report,
+    }
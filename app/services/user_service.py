@@ -1,89 +1,180 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.pagination import PaginationParams
-from app.core.security import hash_password
-from app.models.user import User
+from app.core.database import on_commit
+from app.core.etag import bump_version
+from app.core.pagination import count_cache, paginated
+from app.core.response_cache import response_cache
+from app.core.search import apply_search
+from app.permissions.cache import PRINCIPAL_FIELDS, principal_cache
+from app.core.security import password_hasher
+from app.models.user import User, UserRole
 from app.repositories.user_repository import UserRepository
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserBatchUpdate, UserCreate, UserResponse, UserUpdate
 from typing import List, Optional, Tuple
-from sqlalchemy import select, func
+from sqlalchemy import select, func, Select
 from fastapi import  HTTPException
+from sqlalchemy.exc import IntegrityError
 
 
 async def create_user(user_data: UserCreate, user_repo: UserRepository) -> User:
     
-    # Check if user already exists (optional)
-    existing_user = await user_repo.get_by_email_or_mobile(
-        email=user_data.email, 
-        mobile_no=user_data.mobile_no
-    )
+    # Hash password and create user
+    hashed_password = await password_hasher.hash(user_data.password)
     
-    if existing_user:
+    # Duplicates are caught by the unique constraints in the same statement,
+    # no check-then-insert race
+    new_user = await user_repo.create_user(user_data=user_data,hashed_password=hashed_password)
+    if new_user is None:
         raise HTTPException(
             status_code=400,
             detail="User with this email or username already exists"
         )
     
-    # Hash password and create user
-    hashed_password = hash_password(user_data.password)
-    
-    
-    return await user_repo.create_user(user_data=user_data,hashed_password=hashed_password)
+    # The version first: response-cache entries rendered before it moves
+    # would carry the old ETag
+    on_commit(user_repo.db, lambda: bump_version(User.__tablename__))
+    on_commit(user_repo.db, lambda: count_cache.invalidate(User.__tablename__))
+    on_commit(user_repo.db, lambda: response_cache.invalidate([User.__tablename__]))
+    return new_user
         
     
+# Keyset sort keys for the users list; ``id`` breaks ties so the order is total
+USER_SORT_KEYS = {
+    "id": (User.id,),
+    "full_name": (func.coalesce(User.full_name, ""), User.id),
+}
+
+# Columns matched by ?search=, each backed by a trigram index on PostgreSQL
+USER_SEARCH_COLUMNS = (User.full_name, User.email, User.mobile_no)
+
+# Fields a client may request with ?fields=; the default is all of them
+USER_FIELDS = list(UserResponse.model_fields)
+
+
+def user_projection(fields: Optional[List[str]] = None) -> list:
+    fields = fields or USER_FIELDS
+    unknown = [field for field in fields if field not in USER_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}; expected any of: {', '.join(USER_FIELDS)}",
+        )
+    return [getattr(User, field) for field in dict.fromkeys(fields)]
+
+
+@paginated(USER_SORT_KEYS)
 async def get_users(
     db: AsyncSession, 
     search: Optional[str] = None,
-    pagination: PaginationParams = None, 
-) -> Tuple[List[User], int]:
-    try:
-        # Build base query
-        query = select(User)
-        
-        if search:
-            query = query.where(User.full_name.ilike(f"%{search}%"))
+    search_mode: str = "substring",
+    fields: Optional[List[str]] = None,
+) -> Select:
+    # Build base query: only the requested columns, returned as plain rows
+    query = select(*user_projection(fields))
+    
+    if search:
+        query = apply_search(
+            query,
+            USER_SEARCH_COLUMNS,
+            search,
+            mode=search_mode,
+            dialect=db.bind.dialect.name,
+        )
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await db.execute(count_query)
-        total = total_result.scalar_one()
-        
-        # Apply pagination and get items
-        if pagination:
-            query = query.offset(pagination.offset).limit(pagination.limit)
-        
-        items_result = await db.execute(query)
-        items = items_result.scalars().all()
-        
-        return items, total
-    except Exception as e:
-        print(f"Error in get_users: {e}")
-        raise e
+    return query
+
+
+async def get_user(db: AsyncSession, user_id: int) -> dict:
+    query = select(*user_projection()).where(User.id == user_id)
+    user = (await db.execute(query)).mappings().one_or_none()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return dict(user)
 
 
+def _clean_changes(user_data: UserUpdate) -> dict:
+    # Every updatable column is NOT NULL, so an explicit null means "leave it"
+    changes = {
+        key: value
+        for key, value in user_data.model_dump(exclude_unset=True).items()
+        if value is not None
+    }
+    if "role" in changes and changes["role"] not in UserRole.__members__:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid role, expected one of: {', '.join(UserRole.__members__)}",
+        )
+    return changes
+
+
+async def _after_update(db: AsyncSession, user_ids: List[int], changes: List[dict]) -> None:
+    on_commit(db, lambda: bump_version(User.__tablename__))  # Before the response cache, as in create
+    # Only once committed: a read before then would re-cache the old count
+    on_commit(db, lambda: count_cache.invalidate(User.__tablename__))
+    on_commit(db, lambda: response_cache.invalidate([User.__tablename__]))
+    principals = [
+        user_id
+        for user_id, user_changes in zip(user_ids, changes)
+        if any(field in user_changes for field in PRINCIPAL_FIELDS)
+    ]
+    if principals:
+        # One notification for the whole batch
+        await principal_cache.invalidate(db, principals)
+
+        def evict_principals():
+            # Drop them again once committed, a concurrent request may have
+            # re-cached an old role in between
+            for user_id in principals:
+                principal_cache.evict(user_id)
+
+        on_commit(db, evict_principals)
+
 
 async def update_user(db: AsyncSession,user_id: int, user_data: UserUpdate) -> User:
+    changes = _clean_changes(user_data)
+    user_repo = UserRepository(db)
     try:
-        stmt = select(User).where(
-            (User.id == user_id) 
+        # One UPDATE ... RETURNING, no read-modify-write
+        user_instance = await user_repo.update_user(user_id, changes)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=400,
+            detail="User with this email or username already exists"
+        )
+    if not user_instance:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    await _after_update(db, [user_id], [changes])
+    return user_instance
+
+
+async def update_users(db: AsyncSession, updates: List[UserBatchUpdate]) -> List[User]:
+    """
+    Apply many partial updates in the request's transaction, all or nothing.
+    Issues one existence check, one executemany UPDATE per distinct set of
+    changed columns and one SELECT, however many users are updated.
+    """
+    user_ids = [item.id for item in updates]
+    if len(set(user_ids)) != len(user_ids):
+        raise HTTPException(status_code=400, detail="Each user may appear only once")
+    changes = [_clean_changes(item.changes) for item in updates]
+
+    user_repo = UserRepository(db)
+    missing = set(user_ids) - await user_repo.existing_ids(user_ids)
+    if missing:
+        raise HTTPException(
+            status_code=404, detail=f"Users not found: {sorted(missing)}"
+        )
+
+    try:
+        await user_repo.bulk_update_users(
+            [dict(user_changes, id=user_id) for user_id, user_changes in zip(user_ids, changes) if user_changes]
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=400,
+            detail="User with this email or username already exists"
         )
-        result = await db.execute(stmt)
-        user_instance = result.scalar_one_or_none()
-        if not user_instance:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        # Update task fields
-        update_user_data = user_data.model_dump(exclude_unset=True)
-        for key, value in update_user_data.items():
-            setattr(user_instance, key, value)
-        
-        db.add(user_instance)
-        db.commit()
-        db.refresh(user_instance)
-        
-        return user_instance
 
-    except Exception as e:
-        await db.rollback()
-        print(e)
-        raise e
\ No newline at end of file
+    await _after_update(db, user_ids, changes)
+    return await user_repo.get_by_ids(user_ids)
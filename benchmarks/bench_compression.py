@@ -0,0 +1,104 @@
+"""
+Bandwidth vs CPU of response compression at several levels, on the shapes
+the API actually sends: an enveloped list page and a streamed NDJSON/CSV
+export, compressed chunk by chunk exactly as CompressionMiddleware does.
+
+    python -m benchmarks.bench_compression --page-rows 100 --export-rows 10000
+
+Brotli rows are only printed when the ``brotli`` package is installed.
+"""
+import argparse
+import csv
+import io
+import time
+
+import orjson
+
+from app.middlewares import compression_middleware
+from app.middlewares.compression_middleware import _Compressor
+from app.middlewares.response_middleware import SUCCESS_PREFIX, SUCCESS_SUFFIX
+from app.services.user_export_service import EXPORT_FIELDS
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 11)}
+
+
+def user(i: int) -> dict:
+    return {
+        "mobile_no": f"013{i:08d}",
+        "email": f"user.{i}@bench-example.com",
+        "role": "teacher",
+        "id": i + 1,
+        "username": f"013{i:08d}",
+    }
+
+
+def list_page(rows: int) -> list:
+    body = orjson.dumps(
+        {
+            "items": [user(i) for i in range(rows)],
+            "pagination": {"total": 10_000, "limit": rows, "offset": 0, "has_more": True,
+                           "next_cursor": "eyJzIjoiaWQiLCJkIjoibmV4dCIsInYiOlsxMDBdfQ",
+                           "prev_cursor": None},
+        }
+    )
+    return [SUCCESS_PREFIX + body + SUCCESS_SUFFIX]
+
+
+def ndjson_export(rows: int, chunk_rows: int) -> list:
+    return [
+        b"".join(orjson.dumps(user(i)) + b"\n" for i in range(start, min(start + chunk_rows, rows)))
+        for start in range(0, rows, chunk_rows)
+    ]
+
+
+def csv_export(rows: int, chunk_rows: int) -> list:
+    chunks = []
+    for start in range(0, rows, chunk_rows):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        if start == 0:
+            writer.writeheader()
+        writer.writerows(user(i) for i in range(start, min(start + chunk_rows, rows)))
+        chunks.append(buffer.getvalue().encode())
+    return chunks
+
+
+def compress(chunks: list, encoding: str, level: int) -> int:
+    compressor = _Compressor(encoding, gzip_level=level, brotli_quality=level)
+    size = sum(len(compressor.compress(chunk)) for chunk in chunks[:-1])
+    return size + len(compressor.finish(chunks[-1]))
+
+
+def main(page_rows: int, export_rows: int, chunk_rows: int, repeat: int) -> None:
+    payloads = {
+        f"list page ({page_rows} rows)": list_page(page_rows),
+        f"ndjson export ({export_rows} rows)": ndjson_export(export_rows, chunk_rows),
+        f"csv export ({export_rows} rows)": csv_export(export_rows, chunk_rows),
+    }
+    encodings = ["gzip", "br"] if compression_middleware.brotli is not None else ["gzip"]
+    for name, chunks in payloads.items():
+        raw = sum(len(chunk) for chunk in chunks)
+        print(f"{name}: {raw / 1024:.1f} KiB in {len(chunks)} chunk(s)")
+        for encoding in encodings:
+            for level in LEVELS[encoding]:
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    size = compress(chunks, encoding, level)
+                    timings.append(time.perf_counter() - start)
+                seconds = min(timings)
+                print(
+                    f"  {encoding:4s} level {level:2d}  {size / 1024:8.1f} KiB  "
+                    f"ratio {raw / size:5.1f}x  {seconds * 1000:8.2f} ms  "
+                    f"{raw / seconds / 1e6:7.1f} MB/s"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-rows", type=int, default=100)
+    parser.add_argument("--export-rows", type=int, default=10000)
+    parser.add_argument("--chunk-rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.page_rows, args.export_rows, args.chunk_rows, args.repeat)
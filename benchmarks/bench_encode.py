@@ -0,0 +1,64 @@
+"""
+Encode cost per row of a user list page.
+
+before: route returns a dict, FastAPI validates it against PaginatedUsers,
+        walks it with jsonable_encoder and renders it with json.dumps
+after:  route returns ORJSONResponse over the projected rows
+
+    python -m benchmarks.bench_encode --rows 100 --number 200
+"""
+import argparse
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.models.user import UserRole
+from app.schemas.user import PaginatedUsers
+
+
+def page(rows: int) -> dict:
+    return {
+        "items": [
+            {
+                "mobile_no": f"013{i:08d}",
+                "email": f"user.{i}@bench-example.com",
+                "role": UserRole.TEACHER,
+                "id": i + 1,
+                "username": f"013{i:08d}",
+            }
+            for i in range(rows)
+        ],
+        "pagination": {
+            "total": 10_000,
+            "limit": rows,
+            "offset": 0,
+            "has_more": True,
+            "next_cursor": "eyJzIjoiaWQiLCJkIjoibmV4dCIsInYiOlsxMDBdfQ",
+            "prev_cursor": None,
+        },
+    }
+
+
+def before(content: dict) -> bytes:
+    validated = PaginatedUsers.model_validate(content)
+    return JSONResponse(jsonable_encoder(validated, exclude_unset=True)).body
+
+
+def after(content: dict) -> bytes:
+    return ORJSONResponse(content).body
+
+
+def main(rows: int, number: int) -> None:
+    content = page(rows)
+    for name, encode in (("before", before), ("after", after)):
+        seconds = min(timeit.repeat(lambda: encode(content), number=number, repeat=5)) / number
+        print(f"{name:6s} {seconds * 1e6 / rows:8.2f} us/row   {seconds * 1e3:8.3f} ms/page")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+    main(args.rows, args.number)
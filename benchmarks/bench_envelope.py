@@ -0,0 +1,107 @@
+"""
+Compare the legacy BaseHTTPMiddleware envelope with the pure ASGI one on a
+large ``GET /api/v1/users/`` page.
+
+    python -m benchmarks.bench_envelope --rows 1000 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+from app.middlewares.response_middleware import ResponsePatternMiddleware
+
+
+class LegacyResponsePatternMiddleware(BaseHTTPMiddleware):
+    """The previous buffering implementation, kept here as the baseline."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response_body = b""
+        async for chunk in response.body_iterator:
+            response_body += chunk
+        try:
+            data = json.loads(response_body) if response_body else None
+        except Exception:
+            data = response_body.decode() if response_body else None
+        is_success = 200 <= response.status_code < 400
+        return JSONResponse(
+            status_code=response.status_code,
+            content={
+                "success": is_success,
+                "message": "Request successful." if is_success else "Request failed.",
+                "response": data if is_success else None,
+                "errors": None if is_success else data,
+            },
+        )
+
+
+def fake_users_page(rows: int) -> dict:
+    return {
+        "items": [
+            {
+                "id": i,
+                "mobile_no": f"0170000{i:05d}",
+                "email": f"user{i}@example.com",
+                "role": "TEACHER",
+                "username": f"0170000{i:05d}",
+            }
+            for i in range(rows)
+        ],
+        "pagination": {"total": rows, "limit": rows, "offset": 0},
+    }
+
+
+def build_app(middleware, rows: int) -> FastAPI:
+    app = FastAPI()
+    page = fake_users_page(rows)
+
+    @app.get("/api/v1/users/")
+    async def users():
+        return page
+
+    app.add_middleware(middleware)
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> list:
+    transport = httpx.ASGITransport(app=app)
+    timings = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/api/v1/users/")  # warm up
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get("/api/v1/users/")
+            timings.append(time.perf_counter() - start)
+            assert response.json()["success"] is True
+    return timings
+
+
+def report(name: str, timings: list) -> None:
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[int(len(timings) * 0.99) - 1] * 1000
+    print(f"{name:<10} p50={p50:7.2f}ms  p99={p99:7.2f}ms  rps={len(timings) / sum(timings):8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    for name, middleware in (
+        ("legacy", LegacyResponsePatternMiddleware),
+        ("asgi", ResponsePatternMiddleware),
+    ):
+        timings = asyncio.run(run(build_app(middleware, args.rows), args.requests))
+        report(name, timings)
+
+
+if __name__ == "__main__":
+    main()
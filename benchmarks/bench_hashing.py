@@ -0,0 +1,76 @@
+"""
+p99 latency of an unrelated endpoint while a signup burst hashes passwords,
+with bcrypt on the event loop (old path) vs on the PasswordHasher pool.
+
+    python -m benchmarks.bench_hashing --signups 50 --probes 200
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.security import PasswordHasher, hash_password
+
+
+def build_app(hasher: PasswordHasher = None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/signup")
+    async def signup():
+        if hasher is None:
+            hash_password("correct horse battery staple")
+        else:
+            await hasher.hash("correct horse battery staple")
+        return {"ok": True}
+
+    return app
+
+
+async def run(app: FastAPI, signups: int, probes: int) -> list:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def probe():
+            # Latency is measured from when each probe was due, so time spent
+            # waiting for a blocked event loop is counted too.
+            timings = []
+            origin = time.perf_counter()
+            for i in range(probes):
+                due = origin + i * 0.005
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/ping")
+                timings.append(time.perf_counter() - due)
+            return timings
+
+        burst = [client.post("/signup") for _ in range(signups)]
+        results = await asyncio.gather(probe(), *burst)
+    return sorted(results[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--signups", type=int, default=50)
+    parser.add_argument("--probes", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(workers=args.workers)
+    for name, app in (("on-loop", build_app()), ("pooled", build_app(hasher))):
+        start = time.perf_counter()
+        timings = asyncio.run(run(app, args.signups, args.probes))
+        elapsed = time.perf_counter() - start
+        p50 = timings[len(timings) // 2] * 1000
+        p99 = timings[int(len(timings) * 0.99) - 1] * 1000
+        print(f"{name:<8} /ping p50={p50:8.2f}ms  p99={p99:8.2f}ms  burst wall={elapsed:6.2f}s")
+    print("pool:", hasher.stats())
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
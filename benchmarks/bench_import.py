@@ -0,0 +1,70 @@
+"""
+Rows/sec of the bulk import endpoint vs one POST /api/v1/users/ per user.
+
+    DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db \
+        python -m benchmarks.bench_import --rows 1000
+
+Empties the users table of the target database.
+"""
+import argparse
+import asyncio
+import time
+
+from app.main import app
+from benchmarks.common import admin_client, reset_database
+
+
+def user_row(prefix: str, i: int) -> dict:
+    return {
+        "mobile_no": f"{prefix}{i:08d}",
+        "email": f"{prefix}.{i}@bench-example.com",
+        "role": "TEACHER",
+        "password": f"password-{i}",
+    }
+
+
+async def single_creates(client, rows: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create(i):
+        async with semaphore:
+            response = await client.post("/api/v1/users/", json=user_row("011", i))
+            assert response.status_code == 200, response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*(create(i) for i in range(rows)))
+    return time.perf_counter() - start
+
+
+async def bulk_import(client, rows: int) -> float:
+    async def body():
+        yield b"mobile_no,email,role,password\n"
+        for i in range(rows):
+            row = user_row("012", i)
+            yield f"{row['mobile_no']},{row['email']},{row['role']},{row['password']}\n".encode()
+
+    start = time.perf_counter()
+    response = await client.post(
+        "/api/v1/users/import", content=body(), headers={"content-type": "text/csv"}
+    )
+    elapsed = time.perf_counter() - start
+    report = response.json()["response"]
+    assert report["created"] == rows, report["failed"]
+    return elapsed
+
+
+async def main(rows: int, concurrency: int) -> None:
+    admin_id = await reset_database()
+    async with admin_client(app, admin_id) as client:
+        single = await single_creates(client, rows, concurrency)
+        bulk = await bulk_import(client, rows)
+    print(f"single POST  {rows / single:9.1f} rows/s  ({single:.2f}s)")
+    print(f"bulk import  {rows / bulk:9.1f} rows/s  ({bulk:.2f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.concurrency))
@@ -0,0 +1,90 @@
+"""
+CPU time and peak memory of one 1,000-row user page: whole ORM entities plus
+``UserResponse.from_orm`` (the old list path) vs the column projection.
+
+    DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db \
+        python -m benchmarks.bench_projection --rows 1000 --repeat 20
+
+Empties the users table of the target database.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import select
+
+from app.core.database import async_engine, async_session_factory
+from app.core.pagination import PaginationParams, paginated
+from app.models.user import User, UserRole
+from app.schemas.user import UserResponse
+from app.services.user_service import USER_SORT_KEYS, get_users
+from benchmarks.common import reset_database
+
+
+@paginated(USER_SORT_KEYS)
+async def get_user_entities(db):
+    return select(User)
+
+
+async def entity_page(db, pagination):
+    items, _ = await get_user_entities(db, pagination=pagination)
+    return [UserResponse.from_orm(user).model_dump() for user in items]
+
+
+async def projected_page(db, pagination):
+    items, _ = await get_users(db, pagination=pagination)
+    return items
+
+
+async def seed(rows: int) -> None:
+    await reset_database()
+    async with async_engine.begin() as conn:
+        await conn.execute(
+            User.__table__.insert(),
+            [
+                {
+                    "mobile_no": f"013{i:08d}",
+                    "username": f"013{i:08d}",
+                    "email": f"user.{i}@bench-example.com",
+                    "full_name": f"Bench User {i}",
+                    "role": UserRole.TEACHER,
+                    # Realistic bcrypt-sized value the entity path drags along
+                    "password": "$2b$12$" + "x" * 53,
+                }
+                for i in range(rows)
+            ],
+        )
+
+
+async def measure(fetch, rows: int, repeat: int) -> tuple:
+    pagination = PaginationParams(limit=rows, count="none")
+    timings = []
+    peak = 0
+    for _ in range(repeat):
+        # A fresh session per run, as each request gets its own
+        async with async_session_factory() as db:
+            tracemalloc.start()
+            start = time.perf_counter()
+            items = await fetch(db, pagination)
+            timings.append(time.perf_counter() - start)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            assert len(items) == rows
+    timings.sort()
+    return timings[len(timings) // 2], peak
+
+
+async def main(rows: int, repeat: int) -> None:
+    await seed(rows)
+    for name, fetch in (("ORM + from_orm", entity_page), ("projection", projected_page)):
+        median, peak = await measure(fetch, rows, repeat)
+        print(f"{name:15s} median {median * 1000:8.2f} ms   peak {peak / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
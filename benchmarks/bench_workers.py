@@ -0,0 +1,74 @@
+"""
+Throughput of python -m app.serve with one worker vs several, over real
+sockets. Uses the suite's scenarios; list and login are CPU-bound, so they
+should scale with workers up to the number of cores.
+
+    DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db \\
+        python -m benchmarks.bench_workers --workers 1 4
+
+Empties the users table of the target database. The response cache and
+rate limits are off.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+
+from benchmarks.common import admin_client, reset_database, seed_users
+from benchmarks.suite import Context, SCENARIOS, format_row, free_port, run_scenario, wait_ready
+
+
+async def start_server(port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, STARTUP_SCHEMA_CHECK="off", RESPONSE_CACHE_TTL="0", RATE_LIMIT_ENABLED="False")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    return await wait_ready(process, port)
+
+
+async def run(args) -> dict:
+    admin_id = await reset_database()
+    user_ids = await seed_users(args.users)
+
+    results = {}
+    for workers in args.workers:
+        port = free_port()
+        process = await start_server(port, workers)
+        try:
+            async with admin_client(None, admin_id, base_url=f"http://127.0.0.1:{port}") as client:
+                ctx = Context(client, user_ids)
+                for name in args.scenarios:
+                    requests = args.login_requests if name == "login" else args.requests
+                    result = await run_scenario(ctx, name, requests, args.concurrency, args.warmup)
+                    results[(workers, name)] = result
+                    print(f"{workers:>2} worker(s) " + format_row(name, result))
+        finally:
+            process.terminate()
+            process.wait(timeout=60)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--login-requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=20, help="also spreads connections over the workers")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=["list", "login"])
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    base = args.workers[0]
+    for (workers, name), result in results.items():
+        if workers != base:
+            speedup = result["throughput"] / results[(base, name)]["throughput"]
+            print(f"{name:<7} {workers} vs {base} worker(s): {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Shared helpers for benchmarks that drive the real app.main:app."""
+import math
+from typing import Dict, Sequence
+
+import httpx
+from sqlalchemy import delete
+
+from app.core.database import async_engine
+from app.core.security import create_access_token, hash_password
+from app.models import Base, User
+from app.models.user import UserRole
+
+ADMIN_MOBILE = "01000000000"
+# Every seeded user shares this password (and one bcrypt hash)
+SEED_PASSWORD = "bench-password"
+
+
+async def reset_database() -> int:
+    """Create the schema, empty the users table and add a super admin; returns its id."""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(delete(User))
+        result = await conn.execute(
+            User.__table__.insert().returning(User.id),
+            {
+                "mobile_no": ADMIN_MOBILE,
+                "username": ADMIN_MOBILE,
+                "email": "admin@bench-example.com",
+                "role": UserRole.SUPER_ADMIN,
+                "password": hash_password("admin"),
+            },
+        )
+        return result.scalar_one()
+
+
+def admin_client(app, admin_id: int, base_url: str = "http://bench") -> httpx.AsyncClient:
+    token = create_access_token({"sub": str(admin_id)})
+    transport = httpx.ASGITransport(app=app) if app is not None else None
+    return httpx.AsyncClient(
+        transport=transport,
+        base_url=base_url,
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=60,
+    )
+
+
+def seed_mobile(i: int) -> str:
+    return f"014{i:08d}"
+
+
+async def seed_users(count: int, password: str = SEED_PASSWORD, batch_size: int = 1000) -> list:
+    """Insert ``count`` teachers in batches; returns their ids in insert order."""
+    hashed = hash_password(password)
+    ids = []
+    async with async_engine.begin() as conn:
+        for start in range(0, count, batch_size):
+            rows = [
+                {
+                    "mobile_no": seed_mobile(i),
+                    "username": seed_mobile(i),
+                    "email": f"seed.{i}@bench-example.com",
+                    "full_name": f"Bench User {i}",
+                    "role": UserRole.TEACHER,
+                    "password": hashed,
+                }
+                for i in range(start, min(start + batch_size, count))
+            ]
+            result = await conn.execute(
+                User.__table__.insert().returning(User.id, sort_by_parameter_order=True), rows
+            )
+            ids.extend(result.scalars().all())
+    return ids
+
+
+def percentiles(timings: Sequence[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p95/p99 of ``timings`` (seconds), in milliseconds."""
+    ordered = sorted(timings)
+    if not ordered:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+
+    def rank(p):
+        return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)] * 1000
+
+    return {"p50_ms": rank(50), "p95_ms": rank(95), "p99_ms": rank(99)}
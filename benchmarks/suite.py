@@ -0,0 +1,275 @@
+"""
+Load benchmark of the main API flows, for catching regressions.
+
+Seeds the database, then drives login, create, list (with search) and patch
+through the real app.main:app, either in-process over an ASGI transport or
+against a live uvicorn process, and reports throughput and p50/p95/p99.
+
+    # in-process, save a baseline
+    DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db \\
+        python -m benchmarks.suite --users 5000 --save baseline.json
+
+    # live uvicorn, fail if anything is >10% worse than the baseline
+    DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db \\
+        python -m benchmarks.suite --target live --compare baseline.json
+
+Empties the users table of the target database. The response cache is
+disabled unless --response-cache is given, so list timings measure the
+handler rather than cache hits. Rate limits are off; admission control
+stays on.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.common import (
+    SEED_PASSWORD,
+    admin_client,
+    percentiles,
+    reset_database,
+    seed_mobile,
+    seed_users,
+)
+
+SCENARIOS = ("login", "create", "list", "patch")
+
+# Compared against the baseline; higher is better for throughput only
+COMPARED = {"throughput": "higher", "p50_ms": "lower", "p95_ms": "lower"}
+
+
+class Context:
+    """What the scenarios need to build their requests."""
+
+    def __init__(self, client: httpx.AsyncClient, user_ids: List[int]):
+        self.client = client
+        self.user_ids = user_ids
+        self.created = itertools.count()
+
+
+async def login(ctx: Context, i: int) -> httpx.Response:
+    n = i % len(ctx.user_ids)
+    return await ctx.client.post(
+        "/api/v1/auth/login", data={"username": seed_mobile(n), "password": SEED_PASSWORD}
+    )
+
+
+async def create(ctx: Context, i: int) -> httpx.Response:
+    n = next(ctx.created)
+    return await ctx.client.post(
+        "/api/v1/users/",
+        json={
+            "mobile_no": f"015{n:08d}",
+            "email": f"new.{n}@bench-example.com",
+            "role": "TEACHER",
+            "password": "bench-new-password",
+        },
+    )
+
+
+async def list_users(ctx: Context, i: int) -> httpx.Response:
+    params = {"limit": 20, "offset": (i * 20) % max(len(ctx.user_ids), 1)}
+    if i % 2:
+        params["search"] = f"user {i % 100}"
+    return await ctx.client.get("/api/v1/users/", params=params)
+
+
+async def patch(ctx: Context, i: int) -> httpx.Response:
+    user_id = ctx.user_ids[i % len(ctx.user_ids)]
+    return await ctx.client.patch(f"/api/v1/users/{user_id}", json={"full_name": f"Patched {i}"})
+
+
+REQUESTS: Dict[str, Callable[[Context, int], Awaitable[httpx.Response]]] = {
+    "login": login,
+    "create": create,
+    "list": list_users,
+    "patch": patch,
+}
+
+
+async def run_scenario(ctx: Context, name: str, requests: int, concurrency: int, warmup: int) -> dict:
+    send = REQUESTS[name]
+    for i in range(warmup):
+        await send(ctx, i)
+
+    counter = itertools.count()
+    timings: List[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            started = time.perf_counter()
+            response = await send(ctx, warmup + i)
+            timings.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return dict(
+        requests=requests,
+        errors=errors,
+        throughput=requests / elapsed,
+        **percentiles(timings),
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_uvicorn(port: int, response_cache: bool) -> subprocess.Popen:
+    # The schema was just created by reset_database(), not by Alembic
+    env = dict(os.environ, STARTUP_SCHEMA_CHECK="off", RATE_LIMIT_ENABLED="False")
+    if not response_cache:
+        env["RESPONSE_CACHE_TTL"] = "0"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    return await wait_ready(process, port)
+
+
+async def wait_ready(process: subprocess.Popen, port: int) -> subprocess.Popen:
+    """Return ``process`` once it answers on ``port``; terminate it after 30s."""
+    deadline = time.monotonic() + 30
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as probe:
+        while time.monotonic() < deadline:
+            try:
+                if (await probe.get("/")).status_code == 200:
+                    return process
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("server did not become ready within 30s")
+
+
+async def run(args) -> dict:
+    admin_id = await reset_database()
+    user_ids = await seed_users(args.users)
+
+    process = None
+    if args.target == "asgi":
+        from app.main import app
+        from app.core.admission import rate_limiter
+        from app.core.response_cache import response_cache
+
+        # One client logging in and creating users as fast as it can
+        rate_limiter.enabled = False
+
+        if not args.response_cache:
+            response_cache.ttl = 0
+        client = admin_client(app, admin_id)
+    else:
+        url = args.url
+        if url is None:
+            port = free_port()
+            process = await start_uvicorn(port, args.response_cache)
+            url = f"http://127.0.0.1:{port}"
+        client = admin_client(None, admin_id, base_url=url)
+
+    results = {}
+    try:
+        async with client:
+            ctx = Context(client, user_ids)
+            for name in args.scenarios:
+                requests = args.login_requests if name == "login" else args.requests
+                results[name] = await run_scenario(ctx, name, requests, args.concurrency, args.warmup)
+                print(format_row(name, results[name]))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    return {
+        "meta": {
+            "target": args.target,
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "database": os.environ.get("DATABASE_URL", "").split(":", 1)[0],
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "scenarios": results,
+    }
+
+
+def format_row(name: str, result: dict) -> str:
+    return (
+        f"{name:<7} {result['throughput']:9.1f} req/s  p50 {result['p50_ms']:8.2f}ms  "
+        f"p95 {result['p95_ms']:8.2f}ms  p99 {result['p99_ms']:8.2f}ms  errors {result['errors']}"
+    )
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> List[str]:
+    """Regressions of ``current`` against ``baseline`` beyond ``tolerance`` (a fraction)."""
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        result = current["scenarios"].get(name)
+        if result is None:
+            continue
+        for metric, better in COMPARED.items():
+            before, after = base[metric], result[metric]
+            if not before:
+                continue
+            change = (after - before) / before
+            worse = change < -tolerance if better == "higher" else change > tolerance
+            marker = "REGRESSION" if worse else ""
+            print(f"  {name:<7} {metric:<10} {before:10.2f} -> {after:10.2f}  {change:+7.1%} {marker}")
+            if worse:
+                regressions.append(f"{name} {metric} {change:+.1%}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("asgi", "live"), default="asgi")
+    parser.add_argument("--url", help="live target already running at this URL (same database)")
+    parser.add_argument("--users", type=int, default=1000, help="users to seed")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=50, help="login runs bcrypt, keep it small")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--response-cache", action="store_true", help="leave the response cache on")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed regression, as a fraction")
+    args = parser.parse_args()
+
+    current = asyncio.run(run(args))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"baseline written to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.tolerance)
+        if regressions:
+            print("regressed beyond tolerance:", ", ".join(regressions))
+            sys.exit(1)
+        print("no regressions beyond tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+
+# Settings are read at import time: configure before anything imports the app
+DB_FILE = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.update(
+    DATABASE_URL=f"sqlite+aiosqlite:///{DB_FILE}",
+    DB_POOL_PROFILE="test",
+    DB_ECHO="False",
+    BCRYPT_ROUNDS="4",
+    RATE_LIMIT_ENABLED="False",
+    RESPONSE_CACHE_TTL="0",
+)
+
+import httpx
+import pytest
+from sqlalchemy import delete
+
+from app.core.database import async_engine
+from app.core.pagination import count_cache
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Base, User
+from app.models.user import UserRole
+from app.permissions.cache import principal_cache
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def admin():
+    """A fresh schema holding one super admin; returns the admin's id."""
+    # Process-wide caches must not carry rows from an earlier test
+    count_cache.invalidate()
+    principal_cache.clear()
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(delete(User))
+        result = await conn.execute(
+            User.__table__.insert().returning(User.id),
+            {
+                "mobile_no": "01000000000",
+                "username": "01000000000",
+                "email": "admin@example.com",
+                "role": UserRole.SUPER_ADMIN,
+                "password": "not-a-hash",
+            },
+        )
+        return result.scalar_one()
+
+
+@pytest.fixture
+async def client(admin):
+    token = create_access_token({"sub": str(admin)})
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        yield client
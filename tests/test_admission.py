@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import (
+    LocalBucketBackend,
+    Overloaded,
+    RateLimit,
+    RouteGate,
+    admission,
+    rate_limiter,
+)
+
+pytestmark = pytest.mark.anyio
+
+LIST_ROUTE = "GET /api/v1/users/"
+
+
+async def test_gate_queues_in_order_and_rejects_past_the_queue():
+    gate = RouteGate(limit=1, queue_size=2, timeout=1)
+    await gate.acquire()
+    admitted = []
+
+    async def wait(name):
+        await gate.acquire()
+        admitted.append(name)
+
+    waiters = [asyncio.create_task(wait(name)) for name in ("first", "second")]
+    await asyncio.sleep(0)
+    with pytest.raises(Overloaded):
+        await gate.acquire()
+    assert gate.stats()["queued"] == 2 and gate.rejected == 1
+
+    gate.release()
+    await asyncio.sleep(0.01)
+    assert admitted == ["first"]
+    gate.release()
+    await asyncio.gather(*waiters)
+    assert admitted == ["first", "second"]
+    assert gate.in_flight == 1
+
+
+async def test_gate_wait_times_out():
+    gate = RouteGate(limit=1, queue_size=1, timeout=0.05)
+    await gate.acquire()
+    with pytest.raises(Overloaded):
+        await gate.acquire()
+    assert gate.timed_out == 1 and gate.stats()["queued"] == 0
+    gate.release()
+    assert gate.in_flight == 0
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    gate = RouteGate(limit=1, queue_size=1, timeout=1)
+    await gate.acquire()
+    waiter = asyncio.create_task(gate.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert gate.stats()["queued"] == 0
+    gate.release()
+    assert gate.in_flight == 0
+
+
+@pytest.fixture
+def busy_list_route(monkeypatch):
+    gate = RouteGate(limit=1, queue_size=1, timeout=0.2)
+    monkeypatch.setattr(admission, "enabled", True)
+    monkeypatch.setitem(admission.gates, LIST_ROUTE, gate)
+    return gate
+
+
+async def test_queued_request_runs_once_a_slot_frees(client, busy_list_route):
+    await busy_list_route.acquire()
+    request = asyncio.create_task(client.get("/api/v1/users/"))
+    await asyncio.sleep(0.05)
+    assert busy_list_route.stats()["queued"] == 1
+    busy_list_route.release()
+    assert (await request).status_code == 200
+
+
+async def test_full_route_sheds_with_503(client, busy_list_route):
+    await busy_list_route.acquire()
+    response = await client.get("/api/v1/users/")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    busy_list_route.release()
+
+
+@pytest.fixture
+def rate_limited(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    monkeypatch.setattr(rate_limiter, "backend", LocalBucketBackend(maxsize=100))
+    monkeypatch.setattr(rate_limiter, "default", RateLimit(per_minute=6, burst=2))
+
+
+async def test_empty_bucket_is_a_429_with_retry_after(client, rate_limited):
+    statuses = [(await client.get("/api/v1/users/")).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    response = await client.get("/api/v1/users/")
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+
+
+async def test_invalid_tokens_share_the_ip_bucket(client, rate_limited):
+    headers = {"Authorization": "Bearer not-a-token"}
+    for _ in range(2):
+        await client.get("/api/v1/users/", headers=headers)
+    other = await client.get("/api/v1/users/", headers={"Authorization": "Bearer another-bad-token"})
+    assert other.status_code == 429
+    # A valid token has a bucket of its own
+    assert (await client.get("/api/v1/users/")).status_code == 200
@@ -0,0 +1,17 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_etag_changes_once_a_write_commits(client, admin):
+    first = await client.get(f"/api/v1/users/{admin}")
+    etag = first.headers["etag"]
+    assert (await client.get(f"/api/v1/users/{admin}", headers={"If-None-Match": etag})).status_code == 304
+
+    response = await client.patch(f"/api/v1/users/{admin}", json={"email": "changed@example.com"})
+    assert response.status_code == 200
+
+    after = await client.get(f"/api/v1/users/{admin}", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["etag"] != etag
+    assert after.json()["response"]["email"] == "changed@example.com"
@@ -0,0 +1,118 @@
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.pagination import COUNT_STRATEGIES, encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+
+class Checkouts:
+    """Counts the pooled connections checked out while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_checkout(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(async_engine.sync_engine, "checkout", self._on_checkout)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(async_engine.sync_engine, "checkout", self._on_checkout)
+
+
+@pytest.mark.parametrize("parallel, connections", [(False, 1), (True, 2)])
+async def test_exact_count_connections(client, monkeypatch, parallel, connections):
+    monkeypatch.setattr(settings, "PAGINATION_PARALLEL_COUNT", parallel)
+    with Checkouts() as checkouts:
+        response = await client.get("/api/v1/users/", params={"count": "exact"})
+    assert response.json()["response"]["pagination"]["total"] == 1
+    assert checkouts.count == connections
+
+
+NEW_USER = {"role": "TEACHER", "password": "a-password"}
+
+
+async def create_users(client, count):
+    ids = []
+    for i in range(count):
+        user = dict(NEW_USER, mobile_no=f"017000002{i:02}", email=f"page{i}@example.com")
+        ids.append((await client.post("/api/v1/users/", json=user)).json()["response"]["id"])
+    return ids
+
+
+async def get_page(client, **params):
+    response = await client.get("/api/v1/users/", params=dict(params, fields="id"))
+    assert response.status_code == 200, response.text
+    page = response.json()["response"]
+    return [item["id"] for item in page["items"]], page["pagination"]
+
+
+@pytest.mark.parametrize("sort", ["id", "full_name"])
+async def test_cursors_walk_forward_and_back(client, admin, sort):
+    ids = [admin] + await create_users(client, 4)
+
+    first, info = await get_page(client, limit=2, sort=sort)
+    second, info = await get_page(client, limit=2, sort=sort, cursor=info["next_cursor"])
+    third, info = await get_page(client, limit=2, sort=sort, cursor=info["next_cursor"])
+    assert first + second + third == ids
+    assert not info["has_more"] and info["next_cursor"] is None
+
+    back, _ = await get_page(client, limit=2, sort=sort, cursor=info["prev_cursor"])
+    assert back == second
+
+
+async def test_offset_page_hands_out_a_cursor(client, admin):
+    ids = [admin] + await create_users(client, 3)
+    by_offset, info = await get_page(client, limit=2, offset=1)
+    assert by_offset == ids[1:3]
+    by_cursor, _ = await get_page(client, limit=2, cursor=info["next_cursor"])
+    assert by_cursor == ids[3:]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        encode_cursor("id", "next", ["x"]),
+        encode_cursor("id", "next", [True]),
+        encode_cursor("id", "next", [1, 2]),
+        encode_cursor("id", "sideways", [1]),
+        encode_cursor("full_name", "next", ["", 1]),
+        encode_cursor("full_name", "next", [None, 1]),
+    ],
+)
+async def test_tampered_cursor_is_rejected(client, cursor):
+    response = await client.get("/api/v1/users/", params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("count", ["exact", "estimated", "cached"])
+async def test_count_strategies(client, admin, count):
+    await create_users(client, 2)
+    _, info = await get_page(client, count=count)
+    assert info["total"] == 3
+
+
+async def test_no_count(client):
+    _, info = await get_page(client, count="none", limit=1)
+    assert info["total"] is None and info["has_more"] is False
+
+
+async def test_cached_count_is_invalidated_by_writes(client):
+    _, info = await get_page(client, count="cached")
+    assert info["total"] == 1
+    await create_users(client, 1)
+    _, info = await get_page(client, count="cached")
+    assert info["total"] == 2
+
+
+@pytest.mark.parametrize("count", COUNT_STRATEGIES)
+async def test_search_term_with_a_colon(client, count):
+    response = await client.get("/api/v1/users/", params={"search": "a :b", "count": count})
+    assert response.status_code == 200
+    assert response.json()["response"]["items"] == []
@@ -0,0 +1,94 @@
+import asyncpg
+import pytest
+
+from app.models.user import UserRole
+from app.permissions.cache import Principal, PrincipalCache, PostgresNotifyBackend, principal_cache
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingBackend:
+    def __init__(self):
+        self.published = []
+
+    async def start(self, cache):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, db, user_ids):
+        self.published.append(list(user_ids))
+
+
+@pytest.fixture
+def backend():
+    original, principal_cache.backend = principal_cache.backend, RecordingBackend()
+    yield principal_cache.backend
+    principal_cache.backend = original
+
+
+async def test_batch_role_change_publishes_once(client, backend):
+    ids = []
+    for i in range(5):
+        user = {
+            "mobile_no": f"0170000020{i}",
+            "email": f"batch{i}@example.com",
+            "role": "TEACHER",
+            "password": "a-password",
+        }
+        ids.append((await client.post("/api/v1/users/", json=user)).json()["response"]["id"])
+
+    response = await client.patch("/api/v1/users/", json=[{"id": i, "changes": {"role": "ADMIN"}} for i in ids])
+    assert response.status_code == 200
+    assert backend.published == [ids]
+
+
+
+class FakeConnection:
+    def __init__(self):
+        self.listeners = {}
+        self.on_terminate = None
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    async def close(self):
+        pass
+
+
+async def test_listener_reconnects_and_flushes(monkeypatch):
+    connections = []
+    attempts = []
+
+    async def connect(dsn):
+        attempts.append(dsn)
+        if len(attempts) == 2:
+            raise OSError("database is restarting")
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    backend = PostgresNotifyBackend("postgresql://db/test")
+    backend.RECONNECT_DELAY = 0
+    cache = PrincipalCache(maxsize=10, ttl=60, backend=backend)
+    await cache.start()
+
+    cache.set(Principal(1, UserRole.ADMIN, "u1", "u1@example.com", "01700000001"))
+    connections[0].on_terminate(connections[0])
+    assert cache.get(1) is None  # Evictions may be missed while disconnected
+
+    # Cached while disconnected, flushed once the listener is back
+    cache.set(Principal(2, UserRole.ADMIN, "u2", "u2@example.com", "01700000002"))
+    await backend._reconnect_task
+    assert len(attempts) == 3 and len(connections) == 2
+    assert cache.get(2) is None
+
+    cache.set(Principal(3, UserRole.ADMIN, "u3", "u3@example.com", "01700000003"))
+    connections[1].listeners["principal_cache"](connections[1], 0, "principal_cache", "3")
+    assert cache.get(3) is None
+
+    await cache.stop()
@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.models import Base, User
+from app.models.user import UserRole
+
+pytestmark = pytest.mark.anyio
+
+
+def user_row(name: str, n: int) -> dict:
+    mobile = f"0180000000{n}"
+    return {"mobile_no": mobile, "username": mobile, "email": f"{name}{n}@example.com",
+            "full_name": name, "role": UserRole.TEACHER, "password": "x"}
+
+
+@pytest.fixture
+async def session_factory(tmp_path, monkeypatch):
+    """A primary and a replica on separate SQLite files, each holding one marker user."""
+    engines = {}
+    for name in ("primary", "replica"):
+        engine = database.build_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db", profile="test")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(User), user_row(name, 0))
+        engines[name] = engine
+
+    monkeypatch.setattr(database, "async_engine", engines["primary"])
+    monkeypatch.setattr(database, "replicas", database.ReplicaSet([engines["replica"]]))
+    yield sessionmaker(
+        engines["primary"], class_=AsyncSession, sync_session_class=database.RoutingSession
+    )
+    for engine in engines.values():
+        await engine.dispose()
+
+
+async def served_by(session: AsyncSession) -> set:
+    return set((await session.execute(select(User.full_name))).scalars())
+
+
+async def test_reads_go_to_the_replica(session_factory):
+    async with session_factory(info={"use_primary": False}) as session:
+        assert await served_by(session) == {"replica"}
+
+
+async def test_read_write_sessions_use_the_primary(session_factory):
+    async with session_factory(info={"use_primary": True}) as session:
+        assert await served_by(session) == {"primary"}
+
+
+async def test_writes_go_to_the_primary_and_pin_the_session(session_factory):
+    async with session_factory(info={"use_primary": False}) as session:
+        await session.execute(insert(User), user_row("primary", 1))
+        # Read-your-writes: the rest of the transaction stays on the primary
+        assert await served_by(session) == {"primary"}
+        await session.commit()
+
+    async with session_factory(info={"use_primary": True}) as session:
+        assert len((await session.execute(select(User.id))).all()) == 2
+
+
+async def test_unhealthy_replica_falls_back_to_the_primary(session_factory):
+    database.replicas.mark_unhealthy(database.replicas.engines[0])
+    async with session_factory(info={"use_primary": False}) as session:
+        assert await served_by(session) == {"primary"}
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from fastapi import Response
+
+from app.core.response_cache import LocalBackend, ResponseCache, response_cache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def cache_on(monkeypatch):
+    monkeypatch.setattr(response_cache, "ttl", 30)
+    monkeypatch.setattr(response_cache, "backend", LocalBackend(maxsize=100))
+
+
+async def test_miss_then_hit(client, cache_on):
+    first = await client.get("/api/v1/users/")
+    second = await client.get("/api/v1/users/")
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+    assert second.headers["etag"] == first.headers["etag"]
+    assert "age" in second.headers
+
+
+async def test_query_string_is_part_of_the_key(client, cache_on):
+    await client.get("/api/v1/users/", params={"limit": 5})
+    response = await client.get("/api/v1/users/", params={"limit": 6})
+    assert response.headers["x-cache"] == "MISS"
+
+
+async def test_write_invalidates(client, cache_on):
+    before = await client.get("/api/v1/users/")
+    user = {"mobile_no": "01700000401", "email": "new@example.com", "role": "TEACHER", "password": "pw"}
+    await client.post("/api/v1/users/", json=user)
+
+    after = await client.get("/api/v1/users/")
+    assert after.headers["x-cache"] == "MISS"
+    assert after.headers["etag"] != before.headers["etag"]
+    assert after.json()["response"]["pagination"]["total"] == 2
+
+
+async def test_conditional_leader_stores_the_full_body(client, cache_on):
+    etag = (await client.get("/api/v1/users/", params={"limit": 3})).headers["etag"]
+    response_cache.backend = LocalBackend(maxsize=100)  # Forget it, keep the version
+
+    conditional = await client.get("/api/v1/users/", params={"limit": 3}, headers={"If-None-Match": etag})
+    assert conditional.status_code == 304
+    assert conditional.headers["x-cache"] == "MISS"
+
+    plain = await client.get("/api/v1/users/", params={"limit": 3})
+    assert plain.status_code == 200 and plain.headers["x-cache"] == "HIT"
+    assert plain.json()["response"]["items"]
+
+    hit = await client.get("/api/v1/users/", params={"limit": 3}, headers={"If-None-Match": etag})
+    assert hit.status_code == 304 and hit.headers["x-cache"] == "HIT"
+
+
+async def test_concurrent_misses_compute_once():
+    cache = ResponseCache(LocalBackend(maxsize=10), ttl=30, lock_timeout=1)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return Response(content=b"{}", media_type="application/json")
+
+    results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+    assert len(calls) == 1
+    assert sorted(outcome for _, outcome in results) == ["HIT"] * 4 + ["MISS"]
+    assert cache.stats()["coalesced"] == 4
+
+
+async def test_uncacheable_leader_lets_waiters_compute():
+    cache = ResponseCache(LocalBackend(maxsize=10), ttl=30, lock_timeout=1)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return Response(status_code=404)
+
+    results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(3)))
+    assert len(calls) == 3
+    assert all(outcome == "MISS" for _, outcome in results)
+
+
+class OtherWorkerHoldsLock(LocalBackend):
+    """The lock belongs to another worker, which releases it without storing."""
+
+    def __init__(self):
+        super().__init__(maxsize=10)
+        self.held = True
+
+    async def acquire(self, key, timeout):
+        return False
+
+    async def locked(self, key):
+        return self.held
+
+
+async def test_waiter_stops_polling_when_the_lock_is_released():
+    backend = OtherWorkerHoldsLock()
+    cache = ResponseCache(backend, ttl=30, lock_timeout=5)
+
+    async def compute():
+        return Response(content=b"{}", media_type="application/json")
+
+    async def release_soon():
+        await asyncio.sleep(0.1)
+        backend.held = False
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    (_, outcome), _ = await asyncio.gather(cache.get_or_compute("k", compute), release_soon())
+    assert outcome == "MISS"
+    assert loop.time() - started < 1
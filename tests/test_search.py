@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.search import apply_search, escape_like
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+# Inserted so that the id order differs from the ranked order
+EMAILS = ["joann@example.com", "ann@example.com", "a_b@example.com", "axb@example.com"]
+
+
+@pytest.fixture
+async def users(client):
+    for i, email in enumerate(EMAILS):
+        user = {"mobile_no": f"0170000030{i}", "email": email, "role": "TEACHER", "password": "pw"}
+        assert (await client.post("/api/v1/users/", json=user)).status_code == 200
+
+
+async def search(client, term, mode, **params):
+    response = await client.get(
+        "/api/v1/users/", params=dict(params, search=term, search_mode=mode, fields="email")
+    )
+    assert response.status_code == 200, response.text
+    page = response.json()["response"]
+    return [item["email"] for item in page["items"]], page["pagination"]
+
+
+async def test_prefix_and_substring(client, users):
+    assert (await search(client, "ann", "prefix"))[0] == ["ann@example.com"]
+    assert (await search(client, "ann", "substring"))[0] == ["joann@example.com", "ann@example.com"]
+
+
+@pytest.mark.parametrize("term, expected", [("a_b", ["a_b@example.com"]), ("%", []), ("\\", [])])
+async def test_wildcards_are_literal(client, users, term, expected):
+    assert (await search(client, term, "substring"))[0] == expected
+
+
+async def test_ranked_puts_prefix_matches_first(client, users):
+    emails, _ = await search(client, "ann", "ranked")
+    assert emails == ["ann@example.com", "joann@example.com"]
+    emails, info = await search(client, "0170000030", "ranked", limit=2)
+    assert info["has_more"] and info["next_cursor"] is None  # No cursors for a ranked order
+
+
+async def test_blank_term_is_no_filter(client, users):
+    assert len((await search(client, "   ", "substring"))[0]) == len(EMAILS) + 1
+
+
+def test_escape_like():
+    assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
+
+
+def test_postgres_ranks_by_trigram_similarity():
+    query = apply_search(select(User.id), (User.email, User.mobile_no), "ann", mode="ranked")
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "ILIKE" in sql and "ESCAPE" in sql
+    assert "ORDER BY greatest(similarity(users.email" in sql
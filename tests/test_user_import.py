@@ -0,0 +1,42 @@
+import pytest
+
+from app.core.pagination import count_cache
+
+pytestmark = pytest.mark.anyio
+
+CSV_HEADERS = {"Content-Type": "text/csv"}
+
+
+async def test_quoted_fields_may_span_lines(client):
+    body = (
+        "mobile_no,email,role,password\r\n"
+        '01700000001,one@example.com,TEACHER,"first line\r\nsecond line"\r\n'
+        '01700000002,two@example.com,ADMIN,"say ""hi"""\r\n'
+    )
+    response = await client.post("/api/v1/users/import", content=body, headers=CSV_HEADERS)
+    report = response.json()["response"]
+    assert report["total"] == 2
+    assert report["created"] == 2
+
+
+async def test_unterminated_quote_is_reported(client):
+    body = 'mobile_no,email,role,password\n01700000001,one@example.com,TEACHER,"open\n'
+    report = (await client.post("/api/v1/users/import", content=body, headers=CSV_HEADERS)).json()["response"]
+    assert report["created"] == 0
+    assert report["rows"] == [{"row": 1, "success": False, "error": "Unterminated quoted field"}]
+
+
+async def test_each_batch_invalidates_on_commit(client, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.USER_IMPORT_BATCH_SIZE", 1)
+    before = (await client.get("/api/v1/users/", params={"count": "cached"})).json()["response"]
+    assert before["pagination"]["total"] == 1
+
+    invalidated = []
+    monkeypatch.setattr(count_cache, "invalidate", lambda table=None: invalidated.append(table))
+    body = (
+        "mobile_no,email,role,password\n"
+        "01700000001,one@example.com,TEACHER,pw\n"
+        "01700000002,two@example.com,TEACHER,pw\n"
+    )
+    await client.post("/api/v1/users/import", content=body, headers=CSV_HEADERS)
+    assert invalidated == ["users", "users"]
@@ -0,0 +1,79 @@
+import pytest
+
+from app.core.queries import assert_max_queries, count_queries
+from app.permissions.cache import principal_cache
+
+pytestmark = pytest.mark.anyio
+
+NEW_USER = {
+    "mobile_no": "01700000001",
+    "email": "teacher@example.com",
+    "role": "TEACHER",
+    "password": "a-password",
+}
+
+
+async def test_create_user_round_trips(client):
+    # INSERT ... ON CONFLICT DO NOTHING RETURNING, then the version bump after commit
+    with assert_max_queries(2) as log:
+        response = await client.post("/api/v1/users/", json=NEW_USER)
+    assert response.status_code == 200
+    assert not any(statement.lstrip().upper().startswith("SELECT") for statement in log.statements)
+
+
+async def test_create_duplicate_user_is_one_statement(client):
+    await client.post("/api/v1/users/", json=NEW_USER)
+    with count_queries() as log:
+        response = await client.post("/api/v1/users/", json=NEW_USER)
+    assert response.status_code == 400
+    assert log.count == 1
+
+
+async def test_update_user_round_trips(client, admin):
+    user_id = (await client.post("/api/v1/users/", json=NEW_USER)).json()["response"]["id"]
+    await client.get(f"/api/v1/users/{admin}")  # Caches the admin principal
+
+    # UPDATE ... RETURNING, then the version bump after commit
+    with assert_max_queries(2):
+        response = await client.patch(f"/api/v1/users/{user_id}", json={"email": "renamed@example.com"})
+    assert response.status_code == 200
+    assert response.json()["response"]["email"] == "renamed@example.com"
+
+
+async def test_batch_update_statements_do_not_grow_with_users(client, admin):
+    ids = []
+    for i in range(5):
+        user = dict(NEW_USER, mobile_no=f"0170000010{i}", email=f"teacher{i}@example.com")
+        ids.append((await client.post("/api/v1/users/", json=user)).json()["response"]["id"])
+    await client.get(f"/api/v1/users/{admin}")  # Caches the admin principal
+
+    counts = []
+    for batch in (ids[:1], ids):
+        body = [{"id": user_id, "changes": {"role": "ADMIN"}} for user_id in batch]
+        with count_queries() as log:
+            response = await client.patch("/api/v1/users/", json=body)
+        assert response.status_code == 200
+        counts.append(log.count)
+    assert counts[0] == counts[1]
+
+
+async def test_sparse_fieldsets_return_only_the_requested_fields(client):
+    response = await client.get("/api/v1/users/", params={"fields": "id,email"})
+    assert response.status_code == 200
+    items = response.json()["response"]["items"]
+    assert items and all(set(item) == {"id", "email"} for item in items)
+
+
+async def test_batch_update_returns_loaded_users_as_stored(client, admin):
+    other = (await client.post("/api/v1/users/", json=NEW_USER)).json()["response"]["id"]
+    # A principal-cache miss loads the caller's own row into the session first
+    principal_cache.clear()
+    body = [
+        {"id": admin, "changes": {"email": "boss@example.com", "role": "ADMIN"}},
+        {"id": other, "changes": {"role": "ADMIN"}},
+    ]
+    response = await client.patch("/api/v1/users/", json=body)
+    assert response.status_code == 200
+    mine, theirs = response.json()["response"]
+    assert mine["email"] == "boss@example.com"
+    assert mine["role"] == theirs["role"] == "admin"